@@ -0,0 +1,88 @@
+"""JWT-аутентификация с кешем пользователей и токенов в памяти процесса.
+
+Проверенный токен и загруженный по нему пользователь запоминаются,
+поэтому повторные запросы с тем же токеном не проверяют подпись и не
+обращаются к таблице пользователей. Кеш пользователя сбрасывается
+сигналами post_save и post_delete модели User (api.signals); в других
+процессах устаревшая запись живёт не дольше API_AUTH_CACHE_TTL.
+"""
+
+import copy
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+class TTLCache:
+    """LRU-кеш ограниченного размера с временем жизни записей."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires <= time.monotonic():
+                del self.data[key]
+                return None
+            self.data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.data[key] = (value, time.monotonic() + ttl)
+            self.data.move_to_end(key)
+            if len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+user_cache = TTLCache(settings.API_AUTH_CACHE_SIZE)
+token_cache = TTLCache(settings.API_AUTH_CACHE_SIZE)
+
+
+def invalidate_user(user_id):
+    """Сбрасывает закешированного пользователя."""
+    user_cache.delete(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication с кешем проверенных токенов и пользователей."""
+
+    def get_validated_token(self, raw_token):
+        token = token_cache.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            # Истёкший токен должен снова пройти полную проверку.
+            ttl = min(
+                settings.API_AUTH_CACHE_TTL,
+                token.payload.get('exp', 0) - time.time()
+            )
+            if ttl > 0:
+                token_cache.set(raw_token, token, ttl)
+        return token
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user, settings.API_AUTH_CACHE_TTL)
+        # Копия: запрос может изменить пользователя, не трогая кеш.
+        return copy.copy(user)
@@ -0,0 +1,173 @@
+"""Массовое создание и обновление произведений."""
+
+from django.db import connection, transaction
+from django.db.models import CharField, Value
+from django.utils import timezone
+
+from api.cache import bump_version_on_commit
+from api.serializers import TitleBulkItemSerializer
+from reviews.constants import BULK_CHUNK_SIZE
+from reviews.models import Category, Genre, Title
+
+GenreLink = Title.genre.through
+
+UNKNOWN_SLUG_MESSAGE = 'Объект с slug={slug} не существует.'
+NOT_FOUND_MESSAGE = 'Произведение с id={pk} не найдено.'
+DUPLICATE_ID_MESSAGE = 'Произведение с id={pk} уже есть в запросе.'
+
+
+def resolve_slugs(genre_slugs, category_slugs):
+    """Id жанров и категорий по слагам одним запросом."""
+    genres = Genre.objects.filter(slug__in=genre_slugs).order_by().annotate(
+        kind=Value('genre', output_field=CharField())
+    ).values_list('kind', 'slug', 'id')
+    categories = Category.objects.filter(
+        slug__in=category_slugs
+    ).order_by().annotate(
+        kind=Value('category', output_field=CharField())
+    ).values_list('kind', 'slug', 'id')
+    resolved = {'genre': {}, 'category': {}}
+    for kind, slug, pk in genres.union(categories, all=True):
+        resolved[kind][slug] = pk
+    return resolved['genre'], resolved['category']
+
+
+def validate_chunk(items, offset):
+    """Проверяет формат элементов пачки без обращения к БД."""
+    valid, errors = [], []
+    for index, item in enumerate(items, offset):
+        partial = isinstance(item, dict) and 'id' in item
+        serializer = TitleBulkItemSerializer(data=item, partial=partial)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+    return valid, errors
+
+
+def check_references(data, genre_ids, category_ids, existing, seen_ids):
+    """Ошибки ссылок элемента: неизвестные слаги и id, повторные id.
+
+    `seen_ids` - id произведений из предыдущих элементов запроса.
+    """
+    errors = {}
+    missing_genres = [
+        slug for slug in data.get('genre', ()) if slug not in genre_ids
+    ]
+    if missing_genres:
+        errors['genre'] = [
+            UNKNOWN_SLUG_MESSAGE.format(slug=slug) for slug in missing_genres
+        ]
+    if 'category' in data and data['category'] not in category_ids:
+        errors['category'] = [
+            UNKNOWN_SLUG_MESSAGE.format(slug=data['category'])
+        ]
+    if 'id' in data:
+        if data['id'] not in existing:
+            errors['id'] = [NOT_FOUND_MESSAGE.format(pk=data['id'])]
+        elif data['id'] in seen_ids:
+            # Второй элемент с тем же id записал бы те же связи
+            # с жанрами повторно.
+            errors['id'] = [DUPLICATE_ID_MESSAGE.format(pk=data['id'])]
+    return errors
+
+
+def write_chunk(to_create, to_update, update_fields, genres):
+    """Записывает пачку в одной транзакции."""
+    with transaction.atomic():
+        new_titles = [title for _, title in to_create]
+        if connection.features.can_return_rows_from_bulk_insert:
+            Title.objects.bulk_create(new_titles)
+        else:
+            # Без RETURNING id новых строк неизвестны - сохраняем по одной,
+            # связи с жанрами всё равно вставляются одним запросом.
+            for title in new_titles:
+                title.save()
+        if update_fields:
+            Title.objects.bulk_update(
+                [title for _, title in to_update], update_fields
+            )
+        titles = dict(to_create + to_update)
+        GenreLink.objects.filter(title_id__in=[
+            titles[index].pk for index, _ in to_update if index in genres
+        ]).delete()
+        GenreLink.objects.bulk_create([
+            GenreLink(title_id=titles[index].pk, genre_id=genre_id)
+            for index, genre_set in genres.items()
+            for genre_id in genre_set
+        ])
+
+
+def save_chunk(items, offset, seen_ids):
+    """Сохраняет пачку: bulk_create/bulk_update и одна вставка связей."""
+    valid, errors = validate_chunk(items, offset)
+    genre_ids, category_ids = resolve_slugs(
+        {slug for _, data in valid for slug in data.get('genre', ())},
+        {data['category'] for _, data in valid if 'category' in data},
+    )
+    existing = Title.objects.in_bulk(
+        [data['id'] for _, data in valid if 'id' in data]
+    )
+
+    to_create, to_update, genres = [], [], {}
+    update_fields = set()
+    # bulk_update не вызывает pre_save, auto_now проставляется вручную.
+    now = timezone.now()
+    for index, data in valid:
+        reference_errors = check_references(
+            data, genre_ids, category_ids, existing, seen_ids
+        )
+        if reference_errors:
+            errors.append({'index': index, 'errors': reference_errors})
+            continue
+        if 'id' in data:
+            seen_ids.add(data['id'])
+        fields = {
+            name: value for name, value in data.items()
+            if name not in ('id', 'genre', 'category')
+        }
+        if 'category' in data:
+            fields['category_id'] = category_ids[data['category']]
+        if 'id' in data:
+            title = existing[data['id']]
+            for name, value in fields.items():
+                setattr(title, name, value)
+            title.modified = now
+            update_fields.update(fields)
+            update_fields.add('modified')
+            to_update.append((index, title))
+        else:
+            to_create.append((index, Title(**fields)))
+        if 'genre' in data:
+            genres[index] = {genre_ids[slug] for slug in data['genre']}
+
+    write_chunk(to_create, to_update, update_fields, genres)
+    results = [
+        {'index': index, 'id': title.pk, 'created': created}
+        for created, pairs in ((True, to_create), (False, to_update))
+        for index, title in pairs
+    ]
+    return results, errors
+
+
+def bulk_save_titles(items):
+    """Создаёт и частично обновляет произведения пачками.
+
+    Элемент с `id` обновляется, без `id` - создаётся. Возвращает
+    результаты и ошибки с индексами элементов исходного списка.
+    """
+    results, errors = [], []
+    seen_ids = set()
+    for offset in range(0, len(items), BULK_CHUNK_SIZE):
+        chunk_results, chunk_errors = save_chunk(
+            items[offset:offset + BULK_CHUNK_SIZE], offset, seen_ids
+        )
+        results.extend(chunk_results)
+        errors.extend(chunk_errors)
+    if results:
+        # Массовые операции не отправляют post_save и m2m_changed.
+        bump_version_on_commit('titles')
+    return (
+        sorted(results, key=lambda item: item['index']),
+        sorted(errors, key=lambda item: item['index']),
+    )
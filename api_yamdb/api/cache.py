@@ -0,0 +1,103 @@
+"""Версионированный кеш ответов API.
+
+Каждому пространству имён (например, `titles`) соответствует счётчик
+версии. Ключ закешированного ответа включает текущую версию, поэтому
+для инвалидации достаточно увеличить счётчик: старые записи больше
+не читаются и вытесняются бэкендом кеша по таймауту.
+"""
+
+import time
+from functools import partial
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import urlencode
+
+VERSION_KEY_TEMPLATE = 'api:version:{namespace}'
+MODIFIED_KEY_TEMPLATE = 'api:modified:{namespace}'
+RESPONSE_KEY_TEMPLATE = 'api:response:{namespace}:{version}:{digest}'
+
+
+def get_cache():
+    """Бэкенд кеша API из настройки API_CACHE_ALIAS."""
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def initial_version():
+    # Версия после потери счётчика не должна совпасть с уже
+    # использованной, поэтому начинаем с текущего времени.
+    return int(time.time() * 1000)
+
+
+def get_version(namespace):
+    """Текущая версия пространства имён."""
+    cache = get_cache()
+    key = VERSION_KEY_TEMPLATE.format(namespace=namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_last_modified(namespace):
+    """Время последнего изменения пространства имён (unix time)."""
+    cache = get_cache()
+    key = MODIFIED_KEY_TEMPLATE.format(namespace=namespace)
+    modified = cache.get(key)
+    if modified is None:
+        cache.add(key, int(time.time()), timeout=None)
+        modified = cache.get(key)
+    return modified
+
+
+def bump_version(*namespaces):
+    """Увеличивает версии пространств имён, инвалидируя их кеш."""
+    cache = get_cache()
+    now = int(time.time())
+    for namespace in namespaces:
+        key = VERSION_KEY_TEMPLATE.format(namespace=namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, initial_version(), timeout=None)
+        cache.set(
+            MODIFIED_KEY_TEMPLATE.format(namespace=namespace),
+            now,
+            timeout=None
+        )
+
+
+def bump_version_on_commit(*namespaces):
+    """bump_version после фиксации текущей транзакции.
+
+    Пока транзакция не зафиксирована, параллельный GET видит старые
+    данные: ранний сброс закешировал бы их под новой версией.
+    """
+    transaction.on_commit(partial(bump_version, *namespaces))
+
+
+def get_etag(namespaces, request):
+    """Строгий ETag по версиям пространств имён и параметрам запроса."""
+    versions = ':'.join(
+        f'{namespace}={get_version(namespace)}' for namespace in namespaces
+    )
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = md5(
+        f'{versions}|{request.accepted_media_type}|{request.path}?{query}'
+        .encode('utf-8')
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def get_response_key(namespace, request):
+    """Ключ ответа: версия, путь и нормализованная строка запроса."""
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = md5(f'{request.path}?{query}'.encode('utf-8')).hexdigest()
+    return RESPONSE_KEY_TEMPLATE.format(
+        namespace=namespace,
+        version=get_version(namespace),
+        digest=digest
+    )
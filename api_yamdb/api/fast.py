@@ -0,0 +1,180 @@
+"""Быстрая сериализация списков из строк `.values()`.
+
+Обычный ModelSerializer на каждый объект и поле проходит через
+get_attribute/to_representation и собирает OrderedDict. Для списков
+план полей строится один раз по полям сериализатора (с учётом
+`?fields=`/`?omit=`), а строки `.values()` превращаются в словари
+готовыми функциями. Результат в JSON совпадает с обычным
+сериализатором побайтно.
+"""
+
+from operator import itemgetter
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from api.taxonomy import get_taxonomy
+from reviews.models import Category, Genre, Title
+
+# Поля, значения которых из .values() уже имеют нужный тип:
+# их to_representation - это str()/int() от того же значения.
+PASSTHROUGH_FIELDS = (serializers.CharField, serializers.IntegerField)
+
+
+def make_getter(column, convert=None):
+    if convert is None:
+        return itemgetter(column)
+
+    def getter(row):
+        value = row[column]
+        return None if value is None else convert(value)
+    return getter
+
+
+def make_datetime_converter(field):
+    """to_representation DateTimeField с часовым поясом, найденным заранее.
+
+    Поле на каждое значение заново определяет текущий часовой пояс
+    и формат вывода; здесь они вычисляются один раз на план.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = getattr(field, 'timezone', field.default_timezone())
+    if (field_timezone is None or output_format is None
+            or output_format.lower() != ISO_8601):
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str) or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+class FastListSerializer:
+    """План сериализации списка по полям обычного сериализатора.
+
+    Поле без простого соответствия столбцу должно обрабатываться
+    методом `plan_<имя поля>(field)`, возвращающим (столбцы, функция
+    от строки); иначе быстрый путь недоступен (`supported` = False).
+    """
+
+    def __init__(self, serializer):
+        self.context = serializer.context
+        self.columns = []
+        self.plan = []
+        self.supported = True
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            planner = getattr(self, f'plan_{name}', None)
+            entry = planner(field) if planner else self.plan_field(field)
+            if entry is None:
+                self.supported = False
+                return
+            columns, getter = entry
+            self.columns.extend(
+                column for column in columns if column not in self.columns
+            )
+            self.plan.append((name, getter))
+
+    def plan_field(self, field):
+        if field.source == '*' or '.' in field.source:
+            return None
+        if isinstance(field, serializers.SlugRelatedField):
+            column = f'{field.source}__{field.slug_field}'
+            return (column,), itemgetter(column)
+        if isinstance(field, (
+            serializers.SerializerMethodField, serializers.BaseSerializer,
+            serializers.RelatedField, serializers.ManyRelatedField
+        )):
+            return None
+        if isinstance(field, PASSTHROUGH_FIELDS):
+            convert = None
+        elif isinstance(field, serializers.DateTimeField):
+            convert = make_datetime_converter(field)
+        else:
+            convert = field.to_representation
+        return (field.source,), make_getter(field.source, convert)
+
+    def prepare(self, rows):
+        """Загружает данные, общие для всех строк страницы."""
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        plan = self.plan
+        return [
+            {name: getter(row) for name, getter in plan} for row in rows
+        ]
+
+
+class FastTitleListSerializer(FastListSerializer):
+    """Список произведений: жанры по id из связей и кеша справочников."""
+
+    def plan_rating(self, field):
+        def rating(row):
+            if not row['reviews_count']:
+                return None
+            return int(row['score_sum'] / row['reviews_count'])
+        return ('score_sum', 'reviews_count'), rating
+
+    def plan_genre(self, field):
+        return ('id',), lambda row: self.genres[row['id']]
+
+    def plan_category(self, field):
+        return ('category_id',), lambda row: self.categories.get(
+            row['category_id']
+        )
+
+    def prepare(self, rows):
+        names = {name for name, _ in self.plan}
+        if not names & {'genre', 'category'}:
+            return
+        taxonomy = get_taxonomy(self.context.get('request'))
+        if 'category' in names:
+            self.categories = self.get_categories(rows, taxonomy)
+        if 'genre' in names:
+            self.genres = self.get_genres(rows, taxonomy)
+
+    def get_categories(self, rows, taxonomy):
+        categories = {
+            row['category_id']: taxonomy.categories_by_id.get(
+                row['category_id']
+            )
+            for row in rows if row['category_id'] is not None
+        }
+        missing = [pk for pk, category in categories.items() if not category]
+        if missing:
+            categories.update(Category.objects.in_bulk(missing))
+        return {
+            pk: {'name': category.name, 'slug': category.slug}
+            for pk, category in categories.items() if category
+        }
+
+    def get_genres(self, rows, taxonomy):
+        genres_by_id = taxonomy.genres_by_id
+        genre_ids = {row['id']: [] for row in rows}
+        for title_id, genre_id in Title.genre.through.objects.filter(
+            title_id__in=genre_ids
+        ).values_list('title_id', 'genre_id'):
+            genre_ids[title_id].append(genre_id)
+        missing = {
+            pk for pks in genre_ids.values() for pk in pks
+            if pk not in genres_by_id
+        }
+        if missing:
+            genres_by_id = dict(genres_by_id)
+            genres_by_id.update(Genre.objects.in_bulk(missing))
+        return {
+            title_id: [
+                {'name': genre.name, 'slug': genre.slug}
+                for genre in sorted(
+                    (genres_by_id[pk] for pk in pks),
+                    key=lambda genre: genre.name
+                )
+            ]
+            for title_id, pks in genre_ids.items()
+        }
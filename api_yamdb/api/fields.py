@@ -0,0 +1,85 @@
+"""Поля сериализаторов приложения api."""
+
+from django.utils.encoding import smart_str
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class SlugManyRelatedField(serializers.ManyRelatedField):
+    """Список слагов, разрешаемый одним запросом `slug__in`."""
+
+    default_error_messages = {
+        'does_not_exist': 'Объекты с {slug_name}={values} не существуют.',
+        'invalid': 'Некорректный слаг: {value}.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        # Типы проверяются до dict.fromkeys: словарь или список в
+        # списке слагов нехешируемы.
+        for slug in data:
+            if not isinstance(slug, str):
+                self.fail('invalid', value=slug)
+        slugs = list(dict.fromkeys(data))
+        slug_field = self.child_relation.slug_field
+        objects = self.child_relation.get_slug_map()
+        if objects is None:
+            objects = {
+                getattr(obj, slug_field): obj
+                for obj in self.child_relation.get_queryset().filter(
+                    **{f'{slug_field}__in': slugs}
+                )
+            }
+        missing = [slug for slug in slugs if slug not in objects]
+        if missing:
+            self.fail(
+                'does_not_exist',
+                slug_name=slug_field,
+                values=', '.join(missing)
+            )
+        return [objects[slug] for slug in slugs]
+
+
+class BatchedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который при many=True проверяет слаги пачкой.
+
+    Стандартное поле выполняет get() на каждый слаг; здесь все слаги
+    разрешаются одним запросом, а в ошибке перечисляются неизвестные.
+    Если передан `slug_map` - функция, возвращающая по запросу словарь
+    {слаг: объект}, - слаги разрешаются по нему без запросов к БД.
+    """
+
+    def __init__(self, slug_map=None, **kwargs):
+        self.slug_map = slug_map
+        super().__init__(**kwargs)
+
+    def get_slug_map(self):
+        if self.slug_map is None:
+            return None
+        return self.slug_map(self.context.get('request'))
+
+    def to_internal_value(self, data):
+        objects = self.get_slug_map()
+        if objects is None:
+            return super().to_internal_value(data)
+        try:
+            return objects[data]
+        except KeyError:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field,
+                value=smart_str(data)
+            )
+        except TypeError:
+            self.fail('invalid')
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return SlugManyRelatedField(**list_kwargs)
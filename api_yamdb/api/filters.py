@@ -1,24 +1,113 @@
 import django_filters
+from django.db.models import Count
+from rest_framework import filters
 
-from reviews.models import Title
+from reviews.models import Category, Genre, Title
+
+GENRE_MODE_CHOICES = (
+    ('any', 'Любой из жанров'),
+    ('all', 'Все жанры'),
+)
+
+
+def split_slugs(value):
+    """Список слагов из строки вида `drama,comedy`."""
+    return list(dict.fromkeys(
+        slug.strip() for slug in value.split(',') if slug.strip()
+    ))
 
 
 class TitleFilter(django_filters.FilterSet):
-    """Фильтры для модели произведений."""
+    """Фильтры для модели произведений.
 
-    category = django_filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains'
-    )
-    genre = django_filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
+    Жанры и категории фильтруются по точному совпадению слага.
+    Слаги сначала переводятся в id, после чего фильтрация идёт по
+    индексам внешних ключей и таблицы связи title_genre.
+    """
+
+    category = django_filters.CharFilter(method='filter_category')
+    genre = django_filters.CharFilter(method='filter_genre')
+    genre_mode = django_filters.ChoiceFilter(
+        choices=GENRE_MODE_CHOICES, method='filter_genre_mode'
     )
     name = django_filters.CharFilter(
         field_name='name',
         lookup_expr='icontains'
     )
+    year_min = django_filters.NumberFilter(
+        field_name='year', lookup_expr='gte'
+    )
+    year_max = django_filters.NumberFilter(
+        field_name='year', lookup_expr='lte'
+    )
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'category', 'genre')
+        fields = (
+            'name', 'year', 'year_min', 'year_max', 'category', 'genre',
+            'genre_mode', 'search'
+        )
+
+    def filter_category(self, queryset, name, value):
+        """Произведения из любой из перечисленных категорий."""
+        category_ids = Category.objects.filter(
+            slug__in=split_slugs(value)
+        ).values_list('id', flat=True)
+        return queryset.filter(category_id__in=list(category_ids))
+
+    def filter_genre(self, queryset, name, value):
+        """Произведения с любым (genre_mode=any) или всеми жанрами."""
+        slugs = split_slugs(value)
+        genre_ids = list(
+            Genre.objects.filter(slug__in=slugs).values_list('id', flat=True)
+        )
+        links = Title.genre.through.objects.filter(genre_id__in=genre_ids)
+        if self.form.cleaned_data.get('genre_mode') == 'all':
+            if len(genre_ids) < len(slugs):
+                return queryset.none()
+            links = links.values('title_id').annotate(
+                genres_count=Count('genre_id')
+            ).filter(genres_count=len(genre_ids))
+        return queryset.filter(pk__in=links.values('title_id'))
+
+    def filter_genre_mode(self, queryset, name, value):
+        # Режим учитывается в filter_genre.
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        """Ранжированный полнотекстовый поиск по произведениям."""
+        return queryset.search(value)
+
+
+class TitleOrderingFilter(filters.OrderingFilter):
+    """Сортировка произведений по предрасчитанным индексируемым ключам.
+
+    `?ordering=-rating,year` - по рейтингу по убыванию, затем по году.
+    Для устойчивого порядка (и keyset-пагинации) добавляется id.
+    """
+
+    ordering_fields = {
+        'name': 'name',
+        'year': 'year',
+        'rating': 'rating_key',
+        'reviews_count': 'reviews_count',
+    }
+
+    def get_valid_fields(self, queryset, view, context={}):
+        return [(field, field) for field in self.ordering_fields]
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if not params:
+            return self.get_default_ordering(view)
+        ordering = []
+        for term in params.split(','):
+            term = term.strip()
+            field = self.ordering_fields.get(term.lstrip('-'))
+            if field is None:
+                continue
+            ordering.append(f'-{field}' if term.startswith('-') else field)
+        if not ordering:
+            return self.get_default_ordering(view)
+        return ordering + ['id']
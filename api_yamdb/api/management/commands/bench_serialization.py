@@ -0,0 +1,120 @@
+"""Микробенчмарк сериализации списков: ModelSerializer и api/fast.py."""
+
+import timeit
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.fast import FastListSerializer, FastTitleListSerializer
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleReadSerializer)
+from reviews.models import (Category, Comments, Genre, Review, TaxonomyVersion,
+                            Title)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Сравнивает время сериализации страницы произведений, отзывов и
+    комментариев обычными сериализаторами и по плану из строк .values():
+    python manage.py bench_serialization --size 100
+    Тестовые данные создаются в транзакции, которая откатывается.
+    """
+    help = "Benchmarking list serialization paths."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=100)
+        parser.add_argument('--number', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.create_data(options['size'])
+            request = Request(APIRequestFactory().get('/'))
+            context = {'request': request}
+            titles = Title.objects.filter(category__slug='bench-category')
+            review = titles.order_by('id').first().reviews.order_by(
+                'id'
+            ).first()
+            cases = (
+                ('titles', titles.order_by('name'),
+                 TitleReadSerializer, FastTitleListSerializer),
+                ('reviews', review.title.reviews.order_by('pub_date', 'id'),
+                 ReviewSerializer, FastListSerializer),
+                ('comments', review.comments.order_by('pub_date', 'id'),
+                 CommentSerializer, FastListSerializer),
+            )
+            for name, queryset, serializer_class, fast_class in cases:
+                self.compare(
+                    name, queryset, serializer_class, fast_class, context,
+                    options
+                )
+            transaction.set_rollback(True)
+
+    def compare(self, name, queryset, serializer_class, fast_class, context,
+                options):
+        def regular():
+            return JSONRenderer().render(
+                serializer_class(list(queryset.all()), many=True,
+                                 context=context).data
+            )
+
+        def fast():
+            fast_serializer = fast_class(serializer_class(context=context))
+            return JSONRenderer().render(fast_serializer.to_representation(
+                queryset.values(*fast_serializer.columns)
+            ))
+
+        if regular() != fast():
+            self.stderr.write(f'{name}: ответы различаются!')
+        results = []
+        for function in (regular, fast):
+            results.append(min(timeit.repeat(
+                function, number=options['number'], repeat=options['repeat']
+            )) / options['number'])
+        self.stdout.write(
+            f'{name}: ModelSerializer {results[0] * 1000:.2f} мс, '
+            f'fast {results[1] * 1000:.2f} мс, '
+            f'ускорение x{results[0] / results[1]:.1f}'
+        )
+
+    def create_data(self, size):
+        category = Category.objects.create(name='Bench', slug='bench-category')
+        # SQLite в Django 3.2 не возвращает id из bulk_create -
+        # созданные строки перечитываются.
+        Genre.objects.bulk_create(
+            Genre(name=f'Bench {index}', slug=f'bench-genre-{index}')
+            for index in range(3)
+        )
+        genres = list(Genre.objects.filter(slug__startswith='bench-genre-'))
+        TaxonomyVersion.bump()
+        Title.objects.bulk_create(
+            Title(name=f'Bench {index}', year=2000, category=category,
+                  description='Описание ' * 20, score_sum=7, reviews_count=1)
+            for index in range(size)
+        )
+        titles = list(Title.objects.filter(category=category))
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title_id=title.pk, genre_id=genre.pk)
+            for title in titles for genre in genres[:2]
+        )
+        User.objects.bulk_create(
+            User(username=f'bench-{index}', email=f'bench-{index}@yamdb.fake')
+            for index in range(size)
+        )
+        users = list(User.objects.filter(username__startswith='bench-'))
+        title = titles[0]
+        Review.objects.bulk_create(
+            Review(title=title, author=user, text='Отзыв ' * 20, score=7)
+            for user in users
+        )
+        review = title.reviews.order_by('id').first()
+        Comments.objects.bulk_create(
+            Comments(review=review, author=user, text='Комментарий ' * 10)
+            for user in users
+        )
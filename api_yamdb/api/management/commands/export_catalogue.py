@@ -0,0 +1,53 @@
+"""Модуль для потоковой выгрузки каталога в файл."""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.export import DATASETS, EXPORT_FORMATS, export, parse_since
+from reviews.constants import EXPORT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    """
+    Команда для выгрузки произведений, отзывов или комментариев
+    в NDJSON или CSV:
+    python manage.py export_catalogue titles --format csv --output titles.csv
+    """
+    help = "Streaming export of titles, reviews or comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=tuple(DATASETS))
+        parser.add_argument(
+            '--format', choices=EXPORT_FORMATS, default='ndjson'
+        )
+        parser.add_argument('--since', help='Дата или дата и время ISO 8601')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE
+        )
+        parser.add_argument(
+            '--output', default='-', help='Файл (по умолчанию stdout)'
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = parse_since(options['since'])
+            except ValueError as error:
+                raise CommandError(error)
+        stream = export(
+            options['dataset'], options['format'], since, options['gzip'],
+            options['chunk_size']
+        )
+        if options['output'] == '-':
+            self.write(stream, sys.stdout.buffer)
+        else:
+            with open(options['output'], 'wb') as file:
+                self.write(stream, file)
+
+    def write(self, stream, file):
+        for chunk in stream:
+            file.write(chunk)
+        file.flush()
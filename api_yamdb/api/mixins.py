@@ -0,0 +1,235 @@
+"""Миксины для вьюсетов приложения api."""
+
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.cache import get_cache, get_etag, get_last_modified, get_response_key
+from api.sparse import requested_fields
+
+
+class CachedListRetrieveMixin:
+    """Кеширует ответы list и retrieve в версионированном кеше.
+
+    Версия пространства имён `cache_namespace` увеличивается
+    сигналами при изменении данных (см. api/signals.py).
+    """
+
+    cache_namespace = None
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        key = get_response_key(self.cache_namespace, request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalListMixin:
+    """Условный GET (ETag / Last-Modified / 304) для list.
+
+    ETag и Last-Modified вычисляются по версиям пространств имён из
+    `get_version_namespaces()` без выполнения запроса и сериализации.
+    """
+
+    cache_namespace = None
+
+    def get_version_namespaces(self):
+        return (self.cache_namespace,)
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        namespaces = self.get_version_namespaces()
+        etag = get_etag(namespaces, request)
+        last_modified = max(
+            get_last_modified(namespace) for namespace in namespaces
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalListRetrieveMixin(ConditionalListMixin):
+    """Условный GET для list и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class SparseFieldsetMixin:
+    """Не загружает из БД столбцы полей, исключённых `?fields=`/`?omit=`.
+
+    `sparse_defer_fields` - большие текстовые поля модели, совпадающие
+    по имени с полями сериализатора; они откладываются через defer(),
+    если не попали в ответ.
+    """
+
+    sparse_defer_fields = ()
+
+    def get_requested_fields(self):
+        return requested_fields(
+            self.request, self.get_serializer_class().Meta.fields
+        )
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        names = self.get_requested_fields()
+        if names is None:
+            return queryset
+        deferred = [
+            name for name in self.sparse_defer_fields if name not in names
+        ]
+        return queryset.defer(*deferred) if deferred else queryset
+
+
+class FastListMixin:
+    """list через быстрый сериализатор из строк `.values()` (api/fast.py).
+
+    Если план для полей сериализатора построить нельзя, используется
+    обычный list.
+    """
+
+    fast_list_serializer_class = None
+
+    def get_fast_columns(self, queryset, fast_serializer):
+        # Пагинации нужны значения полей сортировки для курсора.
+        ordering = list(queryset.query.order_by) + list(
+            getattr(self.paginator, 'ordering', ())
+        )
+        columns = list(fast_serializer.columns)
+        for name in ordering + ['id']:
+            name = name.lstrip('-')
+            if name == 'pk':
+                name = 'id'
+            if name not in columns and name not in queryset.query.extra:
+                columns.append(name)
+        return columns
+
+    def list(self, request, *args, **kwargs):
+        fast_serializer = self.fast_list_serializer_class(
+            self.get_serializer()
+        )
+        if not fast_serializer.supported:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.values(
+            *self.get_fast_columns(queryset, fast_serializer)
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                fast_serializer.to_representation(page)
+            )
+        return Response(fast_serializer.to_representation(queryset))
+
+
+class StreamingListMixin:
+    """Отдаёт длинные списки потоком через render_stream рендерера.
+
+    Ответ целиком в памяти не собирается: массив results кодируется
+    частями (см. api/renderers.py).
+    """
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        renderer = getattr(response, 'accepted_renderer', None)
+        if (
+            self.action != 'list'
+            or response.status_code != status.HTTP_200_OK
+            or not hasattr(renderer, 'render_stream')
+        ):
+            return response
+        data = response.data
+        items = data.get('results') if isinstance(data, dict) else data
+        if not isinstance(items, list) or (
+            len(items) < settings.API_STREAM_MIN_ITEMS
+        ):
+            return response
+        streaming = StreamingHttpResponse(
+            renderer.render_stream(
+                data, response.accepted_media_type,
+                response.renderer_context
+            ),
+            content_type=response.content_type or renderer.media_type
+        )
+        for header, value in response.items():
+            if header.lower() != 'content-type':
+                streaming[header] = value
+        return streaming
+
+
+class NestedParentMixin:
+    """Родительский объект вложенного маршрута без лишних запросов.
+
+    Родитель загружается не больше одного раза за запрос. Список
+    фильтруется по аргументам маршрута в основном запросе, а наличие
+    родителя проверяется отдельно, только если страница пуста.
+    """
+
+    parent_model = None
+    # {поле родителя: именованный аргумент маршрута}
+    parent_url_kwargs = {}
+    # Внешний ключ дочерней модели на родителя.
+    parent_field = None
+
+    def get_parent_lookups(self):
+        return {
+            field: self.kwargs.get(kwarg)
+            for field, kwarg in self.parent_url_kwargs.items()
+        }
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_model, **self.get_parent_lookups()
+            )
+        return self._parent
+
+    def get_queryset(self):
+        return super().get_queryset().filter(**{
+            f'{self.parent_field}__{field}': value
+            for field, value in self.get_parent_lookups().items()
+        })
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and not page and not hasattr(self, '_parent'):
+            # Пустая страница: родителя может не быть вовсе.
+            if not self.parent_model.objects.filter(
+                **self.get_parent_lookups()
+            ).exists():
+                raise Http404
+        return page
@@ -0,0 +1,179 @@
+"""Пагинация для вьюсетов приложения api."""
+
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Keyset-пагинация: поиск по ключу сортировки вместо OFFSET.
+
+    Курсор содержит значения полей сортировки последней (или первой)
+    строки страницы. Следующая страница выбирается условием
+    `(поле1, поле2, ...) > (значения курсора)`, поэтому стоимость
+    запроса не зависит от глубины, а COUNT(*) не выполняется.
+    """
+
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    invalid_cursor_message = 'Неверный курсор.'
+    # Сортировка по умолчанию, если у queryset её нет.
+    # Последнее поле должно быть уникальным.
+    ordering = ('id',)
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+
+    def get_ordering(self, queryset):
+        ordering = tuple(queryset.query.order_by) or self.ordering
+        if ordering[-1].lstrip('-') not in ('id', 'pk'):
+            ordering += ('id',)
+        return ordering
+
+    def get_limit(self, request):
+        return LimitOffsetPagination().get_limit(request)
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')))
+            values = cursor['v']
+            reverse = bool(cursor.get('r'))
+            if len(values) != len(self.fields):
+                raise ValueError
+            values = [
+                queryset.model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except (BinasciiError, KeyError, TypeError, ValueError,
+                ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, instance, reverse):
+        values = []
+        for name in self.fields:
+            # Строка страницы - объект модели или словарь из .values().
+            value = (
+                instance[name] if isinstance(instance, dict)
+                else getattr(instance, name)
+            )
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            values.append(value)
+        cursor = {'v': values}
+        if reverse:
+            cursor['r'] = 1
+        encoded = b64encode(json.dumps(cursor).encode('utf-8'))
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded.decode('ascii')
+        )
+
+    def seek(self, values, reverse):
+        """Условие «строка после курсора» для составного ключа."""
+        condition = Q()
+        for index, (name, value) in enumerate(zip(self.fields, values)):
+            descending = self.descending[index] != reverse
+            lookup = f'{name}__{"lt" if descending else "gt"}'
+            step = Q(**{lookup: value})
+            for previous_name, previous_value in zip(
+                self.fields[:index], values[:index]
+            ):
+                step &= Q(**{previous_name: previous_value})
+            condition |= step
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = self.get_ordering(queryset)
+        self.fields = [field.lstrip('-') for field in ordering]
+        self.descending = [field.startswith('-') for field in ordering]
+        self.limit = self.get_limit(request)
+        self.base_url = remove_query_param(
+            request.build_absolute_uri(), 'offset'
+        )
+
+        values, reverse = self.decode_cursor(request, queryset)
+        if reverse:
+            ordering = tuple(
+                field[1:] if field.startswith('-') else f'-{field}'
+                for field in ordering
+            )
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.seek(values, reverse))
+
+        page = list(queryset[:self.limit + 1])
+        has_more = len(page) > self.limit
+        page = page[:self.limit]
+        if reverse:
+            page.reverse()
+
+        if reverse:
+            self.has_next = values is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = values is not None
+        self.page = page
+        return page
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not (self.has_previous and self.page):
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class LimitOffsetOrKeysetPagination(BasePagination):
+    """Пагинация limit/offset или keyset, если в запросе есть cursor.
+
+    Клиенты, передающие `?cursor=` (пустое значение - первая страница),
+    получают непрозрачные курсоры next/previous без поля count.
+    Остальные клиенты продолжают работать с limit/offset.
+    """
+
+    ordering = ('id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if KeysetPagination.cursor_query_param in request.query_params:
+            self.paginator = KeysetPagination(self.ordering)
+        else:
+            self.paginator = LimitOffsetPagination()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+
+class TitlePagination(LimitOffsetOrKeysetPagination):
+    """Пагинация произведений: keyset по (name, id)."""
+
+    ordering = ('name', 'id')
+
+
+class PubDatePagination(LimitOffsetOrKeysetPagination):
+    """Пагинация отзывов и комментариев: keyset по (pub_date, id)."""
+
+    ordering = ('pub_date', 'id')
@@ -29,7 +29,8 @@ class IsAdminModeratorOwnerOrReadOnly(BasePermission):
         return (
             request.method in permissions.SAFE_METHODS
             or request.user.is_authenticated and (
-                obj.author == request.user
+                # Сравниваем ключи, чтобы не загружать автора из БД.
+                obj.author_id == request.user.id
                 or request.user.is_admin
                 or request.user.is_moderator
             )
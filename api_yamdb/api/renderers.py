@@ -0,0 +1,120 @@
+"""Рендереры приложения api."""
+
+import csv
+import io
+import re
+
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = (
+        # Даты кодируются JSONEncoder.default, как в JSONRenderer.
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    )
+
+# Числа, которые orjson и json записывают по-разному: экспоненциальная
+# запись (1e16 / 1e+16) и малые числа (0.00001 / 1e-05). Совпадение
+# внутри строк лишь отправляет ответ на стандартный json.
+FLOAT_MISMATCH = re.compile(rb'[0-9][eE]|0\.0000')
+RESULTS_MARKER = '\x00results\x00'
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson, если он установлен.
+
+    Результат совпадает с JSONRenderer побайтно: даты, Decimal и прочие
+    нестандартные типы кодируются тем же JSONEncoder.default, а ответы
+    с отступами (indent), с числами, которые orjson записал бы иначе,
+    или с целыми больше 64 бит кодируются стандартным json.
+    """
+
+    def fast_dumps(self, data):
+        """Байты JSON через orjson или None, если нужен стандартный json."""
+        if orjson is None or not self.compact or self.ensure_ascii:
+            return None
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            return None
+        if FLOAT_MISMATCH.search(ret):
+            return None
+        # Как JSONRenderer: U+2028 и U+2029 экранируются.
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is not None and self.get_indent(
+            accepted_media_type, renderer_context or {}
+        ) is None:
+            ret = self.fast_dumps(data)
+            if ret is not None:
+                return ret
+        return super().render(data, accepted_media_type, renderer_context)
+
+    def render_stream(self, data, accepted_media_type=None,
+                      renderer_context=None):
+        """Отдаёт JSON частями: массив results - по API_STREAM_CHUNK_SIZE.
+
+        Склеенные части совпадают с результатом render().
+        """
+        if not self.compact or self.get_indent(
+            accepted_media_type, renderer_context or {}
+        ) is not None:
+            yield self.render(data, accepted_media_type, renderer_context)
+            return
+        if isinstance(data, list):
+            head, tail, items = b'', b'', data
+        else:
+            items = data['results']
+            head, tail = self.render(
+                {**data, 'results': RESULTS_MARKER},
+                accepted_media_type, renderer_context
+            ).split(self.render(RESULTS_MARKER), 1)
+        yield head + b'['
+        chunk_size = settings.API_STREAM_CHUNK_SIZE
+        for start in range(0, len(items), chunk_size):
+            chunk = self.render(
+                items[start:start + chunk_size],
+                accepted_media_type, renderer_context
+            )[1:-1]
+            yield chunk if start == 0 else b',' + chunk
+        yield b']' + tail
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """JSON Lines: ответ - одна строка; выгрузки пишут строку на объект."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return super().render(data) + b'\n'
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV для выгрузок; ответ-словарь (ошибка) - одна строка с ключами."""
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, dict):
+            return b''
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(data.keys())
+        writer.writerow(data.values())
+        return buffer.getvalue().encode(self.charset)
@@ -2,12 +2,17 @@
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError
+from django.db.models import Q
 from rest_framework import serializers
 from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.tokens import AccessToken
 
-from api.utils import send_confirmation_email
+from api.fields import BatchedSlugRelatedField
+from api.sparse import SparseFieldsetSerializerMixin
+from api.taxonomy import categories_by_slug, genres_by_slug, get_taxonomy
+from api.utils import is_unique_violation, send_confirmation_email
 from reviews.models import Category, Comments, Genre, Review, Title
 from users.constants import EMAIL_MAX_LENGTH, NAME_MAX_LENGTH
 from users.validators import validate_username
@@ -32,9 +37,15 @@ class SignUpSerializer(serializers.Serializer):
         email = attrs.get('email')
         username = attrs.get('username')
 
-        # Проверка на наличие username и email в БД
-        user_username = User.objects.filter(username=username).first()
-        user_email = User.objects.filter(email=email).first()
+        # Пользователи с таким username или email - одним запросом.
+        # Найденный по обоим полям пользователь передаётся в create.
+        users = User.objects.filter(Q(username=username) | Q(email=email))
+        user_username = user_email = None
+        for user in users:
+            if user.username == username:
+                user_username = user
+            if user.email == email:
+                user_email = user
 
         # Реализация вывода сообещния об ошибке, если оба поля
         # username и email зарегистрированы в БД, но под разными людьми
@@ -62,11 +73,19 @@ class SignUpSerializer(serializers.Serializer):
             if errors:
                 raise serializers.ValidationError(errors)
 
+        attrs['user'] = user_username
         return attrs
 
-    # Валидация полученных данных и создание пользователя
+    # Создание пользователя или повторная отправка кода
     def create(self, validated_data):
-        user, created = User.objects.get_or_create(**validated_data)
+        user = validated_data.pop('user', None)
+        if user is None:
+            try:
+                user = User.objects.create(**validated_data)
+            except IntegrityError:
+                # Параллельная регистрация с тем же username или email:
+                # проверяем заново, чтобы вернуть обычную ошибку.
+                user = self.validate(dict(validated_data))['user']
         confirmation_code = default_token_generator.make_token(user)
         send_confirmation_email(user, confirmation_code)
         return user
@@ -75,8 +94,9 @@ class SignUpSerializer(serializers.Serializer):
 class TokenObtainSerializer(serializers.Serializer):
     """Сериализатор для получения токена."""
 
-    username = serializers.CharField(required=True)
-    confirmation_code = serializers.CharField(required=True)
+    username = serializers.CharField(required=True, write_only=True)
+    confirmation_code = serializers.CharField(required=True, write_only=True)
+    token = serializers.CharField(read_only=True)
 
     def validate(self, attrs):
         """Валидация полученных данных."""
@@ -95,20 +115,19 @@ class TokenObtainSerializer(serializers.Serializer):
             raise serializers.ValidationError(
                 {'Неверный код подтверждения'})
 
-        # Если данные верны, возвращаем данные
+        # Если данные верны, передаём найденного пользователя в create
+        attrs['user'] = user
         return attrs
 
     def create(self, validated_data):
-        """Валидация полученных данных и создание пользователя."""
-        username = validated_data.get('username')
-        user = get_object_or_404(User, username=username)
+        """Выпуск JWT-токена для проверенного пользователя."""
+        token = AccessToken.for_user(validated_data['user'])
+        return {'token': str(token)}
 
-        # Генерируем JWT-токен
-        token = AccessToken.for_user(user)
-        return {'access': str(token)}
 
-
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """Сериализатор для пользователей."""
 
     class Meta:
@@ -135,10 +154,41 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
-    """Сериализатор произведений + rating."""
-    genre = GenreSerializer(many=True, read_only=True)
-    category = CategorySerializer(read_only=True)
+class TitleReadListSerializer(serializers.ListSerializer):
+    """Список произведений: id жанров всей страницы одним запросом."""
+
+    def to_representation(self, data):
+        titles = list(data.all() if hasattr(data, 'all') else data)
+        if 'genre' not in self.child.fields:
+            # Жанры не запрошены (?fields=/?omit=) - связи не читаем.
+            return super().to_representation(titles)
+        pending = [
+            title for title in titles if not hasattr(title, 'genre_ids')
+            and 'genre' not in getattr(
+                title, '_prefetched_objects_cache', {}
+            )
+        ]
+        if pending:
+            genre_ids = {title.pk: [] for title in pending}
+            for title_id, genre_id in Title.genre.through.objects.filter(
+                title_id__in=genre_ids
+            ).values_list('title_id', 'genre_id'):
+                genre_ids[title_id].append(genre_id)
+            for title in pending:
+                title.genre_ids = genre_ids[title.pk]
+        return super().to_representation(titles)
+
+
+class TitleReadSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
+    """Сериализатор произведений + rating.
+
+    Жанры и категория берутся из кеша справочников (api/taxonomy.py),
+    из БД читаются только id жанров произведения.
+    """
+    genre = serializers.SerializerMethodField()
+    category = serializers.SerializerMethodField()
     rating = serializers.IntegerField(read_only=True, default=None)
 
     class Meta:
@@ -146,20 +196,52 @@ class TitleReadSerializer(serializers.ModelSerializer):
         fields = (
             'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
         )
+        list_serializer_class = TitleReadListSerializer
+
+    def get_genre(self, title):
+        prefetched = getattr(title, '_prefetched_objects_cache', {})
+        if 'genre' in prefetched:
+            genres = list(prefetched['genre'])
+        else:
+            if not hasattr(title, 'genre_ids'):
+                title.genre_ids = list(
+                    title.genre.values_list('pk', flat=True)
+                )
+            genres_by_id = get_taxonomy(
+                self.context.get('request')
+            ).genres_by_id
+            if all(pk in genres_by_id for pk in title.genre_ids):
+                genres = sorted(
+                    (genres_by_id[pk] for pk in title.genre_ids),
+                    key=lambda genre: genre.name
+                )
+            else:
+                genres = title.genre.all()
+        return GenreSerializer(genres, many=True).data
+
+    def get_category(self, title):
+        if title.category_id is None:
+            return None
+        category = get_taxonomy(
+            self.context.get('request')
+        ).categories_by_id.get(title.category_id) or title.category
+        return CategorySerializer(category).data
 
 
 class TitleSerializer(serializers.ModelSerializer):
     """Сериализатор произведений."""
-    genre = serializers.SlugRelatedField(
+    genre = BatchedSlugRelatedField(
         queryset=Genre.objects.all(),
+        slug_map=genres_by_slug,
         slug_field='slug',
         write_only=True,
         many=True,
         allow_null=False,
         allow_empty=False,
     )
-    category = serializers.SlugRelatedField(
+    category = BatchedSlugRelatedField(
         queryset=Category.objects.all(),
+        slug_map=categories_by_slug,
         slug_field='slug',
     )
 
@@ -168,11 +250,42 @@ class TitleSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'year', 'description', 'genre', 'category',)
 
     def to_representation(self, instance):
-        title_read_serializer = TitleReadSerializer(instance)
-        return title_read_serializer.data
+        genres = getattr(self, '_validated_data', {}).get('genre')
+        if genres is not None:
+            # Жанры уже получены при валидации - кладём их в кеш
+            # prefetch_related, чтобы не запрашивать повторно.
+            cached_genres = instance.genre.all()
+            cached_genres._result_cache = sorted(
+                set(genres), key=lambda genre: genre.name
+            )
+            cached_genres._prefetch_done = True
+            if not hasattr(instance, '_prefetched_objects_cache'):
+                instance._prefetched_objects_cache = {}
+            instance._prefetched_objects_cache['genre'] = cached_genres
+        return TitleReadSerializer(instance, context=self.context).data
+
+
+class TitleBulkItemSerializer(serializers.ModelSerializer):
+    """Сериализатор элемента массовой записи произведений.
+
+    Слаги жанров и категории только проверяются на формат:
+    они разрешаются в объекты одним запросом на пачку (см. api/bulk.py).
+    """
 
+    id = serializers.IntegerField(required=False)
+    genre = serializers.ListField(
+        child=serializers.SlugField(), allow_empty=False
+    )
+    category = serializers.SlugField()
+
+    class Meta:
+        model = Title
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
 
-class CommentSerializer(serializers.ModelSerializer):
+
+class CommentSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """Сериализатор комментариев."""
 
     author = serializers.SlugRelatedField(
@@ -185,7 +298,9 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date')
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """Сериализатор отзывов."""
 
     author = serializers.SlugRelatedField(
@@ -197,14 +312,17 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date')
 
-    def validate(self, data):
-        """Проверяем, что отзыв только один."""
-        request = self.context.get('request')
-        if request.method == 'POST' and Review.objects.filter(
-            title_id=self.context.get('view').kwargs.get('title_id'),
-            author=request.user
-        ).first():
-            raise ValidationError(
+    def create(self, validated_data):
+        """Создаёт отзыв; повторный отзыв отсекает ограничение в БД.
+
+        Отдельная проверка перед вставкой стоила бы лишнего запроса и
+        всё равно не защищала бы от параллельных запросов.
+        """
+        try:
+            return super().create(validated_data)
+        except IntegrityError as error:
+            if not is_unique_violation(error, Review, 'unique_review'):
+                raise
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
                 'Вы уже писали отзыв на данное произведение.'
-            )
-        return data
+            ]})
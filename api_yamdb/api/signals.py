@@ -0,0 +1,92 @@
+"""Сигналы для инвалидации кешей API."""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import invalidate_user
+from api.cache import bump_version_on_commit
+from reviews.models import Category, Comments, Genre, Review, Title
+from reviews.signals import ratings_rebuilt
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Title)
+@receiver(m2m_changed, sender=Title.genre.through)
+@receiver(ratings_rebuilt)
+def invalidate_titles(sender, **kwargs):
+    """Сбрасывает кеш списка и карточек произведений."""
+    bump_version_on_commit('titles')
+
+
+@receiver(post_delete, sender=Title)
+def invalidate_deleted_title(sender, instance, **kwargs):
+    """Сбрасывает кеш произведений и отзывов удалённого произведения."""
+    bump_version_on_commit('titles', f'reviews:{instance.pk}')
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genres(sender, **kwargs):
+    """Сбрасывает кеш жанров и вложенных в произведения жанров."""
+    bump_version_on_commit('titles', 'genres')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, **kwargs):
+    """Сбрасывает кеш категорий и вложенных в произведения категорий."""
+    bump_version_on_commit('titles', 'categories')
+
+
+@receiver(post_save, sender=Review)
+def invalidate_reviews(sender, instance, **kwargs):
+    """Сбрасывает кеш отзывов произведения и его рейтинга."""
+    # Отзыв мог быть перенесён от другого произведения.
+    title_ids = {
+        instance.title_id, getattr(instance, '_loaded_title_id', None)
+    } - {None}
+    bump_version_on_commit('titles', *(
+        f'reviews:{title_id}' for title_id in title_ids
+    ))
+
+
+@receiver(post_delete, sender=Review)
+def invalidate_deleted_review(sender, instance, **kwargs):
+    """Сбрасывает кеш отзывов и комментариев удалённого отзыва."""
+    bump_version_on_commit(
+        'titles', f'reviews:{instance.title_id}', f'comments:{instance.pk}'
+    )
+
+
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+def invalidate_comments(sender, instance, **kwargs):
+    """Сбрасывает кеш комментариев к отзыву."""
+    bump_version_on_commit(f'comments:{instance.review_id}')
+
+
+@receiver(post_save, sender=User)
+def invalidate_renamed_user(sender, instance, created, **kwargs):
+    """Сбрасывает кеш ответов с username автора, если он изменился.
+
+    У нового пользователя ещё нет отзывов и комментариев.
+    """
+    if not created and instance.username != getattr(
+        instance, '_loaded_username', None
+    ):
+        bump_version_on_commit('users')
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user(sender, **kwargs):
+    """Сбрасывает кеш ответов, где выводился username автора."""
+    bump_version_on_commit('users')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_authenticated_user(sender, instance, **kwargs):
+    """Сбрасывает пользователя из кеша аутентификации."""
+    invalidate_user(instance.pk)
@@ -0,0 +1,64 @@
+"""Выборочные поля ответа: параметры `?fields=` и `?omit=`.
+
+`?fields=id,name` оставляет в ответе только перечисленные поля,
+`?omit=description` убирает перечисленные. Параметры действуют только
+на чтение (GET/HEAD/OPTIONS); неизвестные имена полей - ошибка 400.
+"""
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+UNKNOWN_FIELDS_MESSAGE = 'Неизвестные поля: {fields}.'
+
+
+def parse_field_names(value):
+    return [name for name in (
+        part.strip() for part in value.split(',')
+    ) if name]
+
+
+def requested_fields(request, available):
+    """Имена полей ответа с учётом fields/omit или None, если все.
+
+    Порядок полей остаётся как в сериализаторе.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    fields = parse_field_names(request.query_params.get(FIELDS_PARAM, ''))
+    omit = parse_field_names(request.query_params.get(OMIT_PARAM, ''))
+    if not fields and not omit:
+        return None
+    unknown = [name for name in fields + omit if name not in available]
+    if unknown:
+        raise ValidationError({
+            FIELDS_PARAM if set(unknown) & set(fields) else OMIT_PARAM: [
+                UNKNOWN_FIELDS_MESSAGE.format(fields=', '.join(unknown))
+            ]
+        })
+    return [
+        name for name in available
+        if (not fields or name in fields) and name not in omit
+    ]
+
+
+class SparseFieldsetSerializerMixin:
+    """Оставляет в сериализаторе только запрошенные поля.
+
+    Поля отбрасываются до сериализации, поэтому их значения (в том числе
+    связанные объекты) не вычисляются.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.parent is not None and not isinstance(
+            self.parent, ListSerializer
+        ):
+            # Вложенный сериализатор - отбор полей относится к внешнему.
+            return fields
+        names = requested_fields(self.context.get('request'), list(fields))
+        if names is None:
+            return fields
+        return {name: fields[name] for name in names}
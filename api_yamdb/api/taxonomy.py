@@ -0,0 +1,54 @@
+"""Кеш справочников жанров и категорий в памяти процесса.
+
+Жанров и категорий немного, а меняются они редко, поэтому процесс
+держит их целиком. Актуальность проверяется по строке TaxonomyVersion
+не чаще одного раза за запрос; при изменении версии (в любом процессе)
+справочники перечитываются.
+"""
+
+from reviews.models import Category, Genre, TaxonomyVersion
+
+_taxonomy = None
+
+
+class Taxonomy:
+    """Снимок справочников с индексами по id и слагу."""
+
+    def __init__(self, version, genres, categories):
+        self.version = version
+        self.genres = genres
+        self.categories = categories
+        self.genres_by_id = {genre.pk: genre for genre in genres}
+        self.genres_by_slug = {genre.slug: genre for genre in genres}
+        self.categories_by_id = {
+            category.pk: category for category in categories
+        }
+        self.categories_by_slug = {
+            category.slug: category for category in categories
+        }
+
+
+def get_taxonomy(request=None):
+    """Актуальные справочники; результат проверки запоминается в запросе."""
+    global _taxonomy
+    taxonomy = getattr(request, '_taxonomy', None)
+    if taxonomy is not None:
+        return taxonomy
+    version = TaxonomyVersion.get_current()
+    taxonomy = _taxonomy
+    if taxonomy is None or taxonomy.version != version:
+        taxonomy = Taxonomy(
+            version, list(Genre.objects.all()), list(Category.objects.all())
+        )
+        _taxonomy = taxonomy
+    if request is not None:
+        request._taxonomy = taxonomy
+    return taxonomy
+
+
+def genres_by_slug(request):
+    return get_taxonomy(request).genres_by_slug
+
+
+def categories_by_slug(request):
+    return get_taxonomy(request).categories_by_slug
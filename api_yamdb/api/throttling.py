@@ -0,0 +1,180 @@
+"""Ограничение частоты запросов к эндпоинтам регистрации и токена.
+
+Ограничения - корзины токенов: корзина вмещает N запросов и
+пополняется на N за период, поэтому короткий всплеск допустим, а
+средняя частота - не выше заданной. Частоты задаются в
+REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] по ключам `<scope>_ip` и
+`<scope>_identity` (например, '5/min'). Корзины хранятся в памяти
+процесса или, если задан API_THROTTLE_CACHE_ALIAS, в общем кеше.
+"""
+
+import time
+from collections.abc import Mapping
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+BUCKET_KEY_TEMPLATE = 'api:throttle:{scope}:{kind}:{ident}'
+# Сколько корзин хранить в памяти процесса.
+LOCAL_MAX_BUCKETS = 100000
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """'5/min' -> (5, 60): ёмкость корзины и период в секундах."""
+    num, period = rate.split('/')
+    return int(num), PERIODS[period[0]]
+
+
+def take_token(state, now, capacity, period):
+    """Новое состояние корзины и ожидание в секундах (0 - пропустить).
+
+    Состояние - (токены, время обновления) или None для новой корзины.
+    """
+    speed = capacity / period
+    tokens, updated = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * speed)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) / speed
+
+
+class LocalBucketStore:
+    """Корзины в памяти процесса."""
+
+    def __init__(self, max_buckets=LOCAL_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self.buckets = {}
+        self.lock = Lock()
+
+    def consume(self, key, capacity, period):
+        now = time.monotonic()
+        with self.lock:
+            state, wait = take_token(
+                self.buckets.pop(key, None), now, capacity, period
+            )
+            self.buckets[key] = state
+            if len(self.buckets) > self.max_buckets:
+                # Давно не обновлявшиеся корзины - в начале словаря.
+                del self.buckets[next(iter(self.buckets))]
+        return wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheBucketStore:
+    """Корзины в общем кеше, видимые всем процессам.
+
+    Чтение и запись состояния не атомарны: при одновременных запросах
+    одного клиента несколько из них могут пройти сверх лимита.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def consume(self, key, capacity, period):
+        cache = caches[self.alias]
+        state, wait = take_token(
+            cache.get(key), time.time(), capacity, period
+        )
+        cache.set(key, state, timeout=period)
+        return wait
+
+    def clear(self):
+        caches[self.alias].clear()
+
+
+local_store = LocalBucketStore()
+
+
+def get_store():
+    """Хранилище корзин из настройки API_THROTTLE_CACHE_ALIAS."""
+    alias = settings.API_THROTTLE_CACHE_ALIAS
+    return CacheBucketStore(alias) if alias else local_store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Корзина токенов на каждый ключ из get_idents.
+
+    Запрос проходит, только если токен нашёлся во всех корзинах.
+    """
+
+    scope = None
+    kind = None
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(
+            f'{self.scope}_{self.kind}'
+        )
+
+    def get_idents(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.wait_time = 0
+        rate = self.get_rate()
+        if rate is None:
+            return True
+        capacity, period = parse_rate(rate)
+        store = get_store()
+        for ident in self.get_idents(request):
+            self.wait_time = max(self.wait_time, store.consume(
+                BUCKET_KEY_TEMPLATE.format(
+                    scope=self.scope, kind=self.kind, ident=ident
+                ),
+                capacity, period
+            ))
+        return not self.wait_time
+
+    def wait(self):
+        return self.wait_time
+
+
+class IPThrottle(TokenBucketThrottle):
+    """Ограничение по IP-адресу клиента."""
+
+    kind = 'ip'
+
+    def get_idents(self, request):
+        return [self.get_ident(request)]
+
+
+class IdentityThrottle(TokenBucketThrottle):
+    """Ограничение по значениям полей запроса (username, email)."""
+
+    kind = 'identity'
+    fields = ()
+
+    def get_idents(self, request):
+        data = request.data
+        if not isinstance(data, Mapping):
+            # Например, JSON-массив: ошибку вернёт сериализатор.
+            return []
+        return [
+            f'{field}:{str(data[field]).strip().lower()}'
+            for field in self.fields
+            if data.get(field)
+        ]
+
+
+class SignUpIPThrottle(IPThrottle):
+    scope = 'signup'
+
+
+class SignUpIdentityThrottle(IdentityThrottle):
+    scope = 'signup'
+    fields = ('username', 'email')
+
+
+class TokenIPThrottle(IPThrottle):
+    scope = 'token'
+
+
+class TokenIdentityThrottle(IdentityThrottle):
+    scope = 'token'
+    fields = ('username',)
@@ -5,7 +5,7 @@ from rest_framework.routers import DefaultRouter, SimpleRouter
 
 from api.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
                        ReviewViewSet, SignUpViewSet, TitleViewSet, UserViewSet,
-                       token_obtain_view)
+                       export_view, token_obtain_view)
 
 router_v1 = DefaultRouter()  # Роутер API v1
 
@@ -33,6 +33,8 @@ urlpatterns = [
     path('v1/', include([
         # Авторизация
         path('auth/token/', token_obtain_view),
+        # Выгрузка каталога для администраторов
+        path('export/<str:dataset>/', export_view),
         # Подключение роутера
         path('', include(router_v1.urls)),
         # Подключение роутера для сложных URL
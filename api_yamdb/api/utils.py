@@ -1,13 +1,30 @@
-"""Утилита для отправки кода подтверждения пользователю модели User."""
+"""Утилиты приложения api."""
 
-from django.conf import settings
-from django.core.mail import send_mail
+from users.mail import enqueue_email
 
 
 def send_confirmation_email(user, confirmation_code):
-    """Отправка кода подтверждения."""
+    """Отправка кода подтверждения через очередь писем."""
     subject = 'Код подтверждения для YaMDB'
     message = f'Ваш код подтверждения: {confirmation_code}'
-    from_email = settings.DEFAULT_FROM_EMAIL
-    recipient_list = [user.email]
-    send_mail(subject, message, from_email, recipient_list)
+    enqueue_email(subject, message, user.email)
+
+
+def is_unique_violation(error, model, constraint_name):
+    """Вызвана ли IntegrityError нарушением ограничения constraint_name.
+
+    PostgreSQL и MySQL называют ограничение в тексте ошибки, SQLite
+    перечисляет столбцы: `UNIQUE constraint failed: таблица.столбец, ...`.
+    """
+    message = str(error)
+    if constraint_name in message:
+        return True
+    constraint = next(
+        constraint for constraint in model._meta.constraints
+        if constraint.name == constraint_name
+    )
+    table = model._meta.db_table
+    return 'UNIQUE' in message and all(
+        f'{table}.{model._meta.get_field(field).column}' in message
+        for field in constraint.fields
+    )
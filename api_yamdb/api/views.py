@@ -1,24 +1,42 @@
 """Вьюсеты для работы с моделями приложений reviews и users."""
 
+from functools import partial
+
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
-from django.shortcuts import get_object_or_404
+from django.http import Http404, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (action, api_view,
+                                       authentication_classes,
+                                       permission_classes, renderer_classes,
+                                       throttle_classes)
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 
-from api.filters import TitleFilter
+from api.bulk import bulk_save_titles
+from api.export import DATASETS, export, parse_since
+from api.fast import FastListSerializer, FastTitleListSerializer
+from api.filters import TitleFilter, TitleOrderingFilter
+from api.mixins import (CachedListRetrieveMixin, ConditionalListRetrieveMixin,
+                        FastListMixin, NestedParentMixin, SparseFieldsetMixin,
+                        StreamingListMixin)
+from api.pagination import PubDatePagination, TitlePagination
 from api.permissions import (IsAdmin, IsAdminModeratorOwnerOrReadOnly,
                              IsAdminOrReadOnly)
+from api.renderers import CSVRenderer, NDJSONRenderer
 from api.serializers import (CategorySerializer, CommentSerializer,
                              GenreSerializer, ReviewSerializer,
                              SignUpSerializer, TitleReadSerializer,
                              TitleSerializer, TokenObtainSerializer,
                              UserSerializer)
+from api.taxonomy import get_taxonomy
+from api.throttling import (SignUpIdentityThrottle, SignUpIPThrottle,
+                            TokenIdentityThrottle, TokenIPThrottle)
 from api.viewset import CategoryGenreViewSet
+from reviews.constants import (BULK_MAX_ITEMS, TOP_TITLES_LIMIT,
+                               TOP_TITLES_MAX_LIMIT)
 from reviews.models import Category, Comments, Genre, Review, Title
 
 User = get_user_model()
@@ -28,85 +46,178 @@ class CategoryViewSet(CategoryGenreViewSet):
     """Вьюсет для категорий."""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_namespace = 'categories'
+    taxonomy_attr = 'categories'
 
 
 class GenreViewSet(CategoryGenreViewSet):
     """Вьюсет для жанров."""
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
-
-
-class TitleViewSet(viewsets.ModelViewSet):
+    cache_namespace = 'genres'
+    taxonomy_attr = 'genres'
+
+
+class TitleViewSet(
+    ConditionalListRetrieveMixin,
+    CachedListRetrieveMixin,
+    FastListMixin,
+    SparseFieldsetMixin,
+    StreamingListMixin,
+    viewsets.ModelViewSet
+):
     """Вьюсет модели Title."""
 
-    queryset = (
-        Title.objects.all().annotate(
-            rating=Avg('reviews__score')
-        ).order_by('name')
-    )
+    queryset = Title.objects.all().order_by('name')
     serializer_class = TitleSerializer
     permission_classes = (IsAdminOrReadOnly,)
     http_method_names = ('get', 'post', 'patch', 'delete')
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, TitleOrderingFilter)
     filterset_class = TitleFilter
+    pagination_class = TitlePagination
+    cache_namespace = 'titles'
+    sparse_defer_fields = ('description',)
+    fast_list_serializer_class = FastTitleListSerializer
 
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action in ('list', 'retrieve', 'top'):
             return TitleReadSerializer
         return TitleSerializer
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """Массовое создание (без id) и частичное обновление (с id)."""
+        if not isinstance(request.data, list):
+            raise ValidationError('Ожидается список произведений.')
+        if len(request.data) > BULK_MAX_ITEMS:
+            raise ValidationError(
+                f'Не больше {BULK_MAX_ITEMS} произведений за запрос.'
+            )
+        results, errors = bulk_save_titles(request.data)
+        return Response(
+            {'results': results, 'errors': errors},
+            status=(
+                status.HTTP_400_BAD_REQUEST if errors and not results
+                else status.HTTP_200_OK
+            )
+        )
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'], url_path='top')
+    def top(self, request):
+        """Лучшие по рейтингу произведения в каждом жанре и категории."""
+        return self.get_conditional_response(
+            partial(self.get_cached_response, self.get_top), request
+        )
+
+    def get_top(self, request):
+        try:
+            limit = int(request.query_params.get('limit', TOP_TITLES_LIMIT))
+        except ValueError:
+            limit = TOP_TITLES_LIMIT
+        limit = min(max(limit, 1), TOP_TITLES_MAX_LIMIT)
+
+        genre_boards, category_boards = Title.objects.leaderboards(limit)
+        title_ids = {
+            title_id
+            for boards in (genre_boards, category_boards)
+            for title_ids in boards.values()
+            for title_id in title_ids
+        }
+        queryset = list(self.get_queryset().filter(pk__in=title_ids))
+        # Ключ - pk, а не поле id: его можно исключить через ?omit=id.
+        titles = dict(zip(
+            (title.pk for title in queryset),
+            self.get_serializer(queryset, many=True).data
+        ))
+
+        def serialize(groups, boards):
+            return [
+                {
+                    'name': group.name,
+                    'slug': group.slug,
+                    'titles': [titles[pk] for pk in boards[group.pk]],
+                }
+                for group in groups if group.pk in boards
+            ]
+
+        taxonomy = get_taxonomy(request)
+        return Response({
+            'genres': serialize(taxonomy.genres, genre_boards),
+            'categories': serialize(taxonomy.categories, category_boards),
+        })
+
+
+class ReviewViewSet(
+    NestedParentMixin,
+    ConditionalListRetrieveMixin,
+    FastListMixin,
+    SparseFieldsetMixin,
+    StreamingListMixin,
+    viewsets.ModelViewSet
+):
     """Вьюсет для отзывов."""
 
-    queryset = Review.objects.all()
+    queryset = Review.objects.select_related('author')
     serializer_class = ReviewSerializer
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsAdminModeratorOwnerOrReadOnly
     )
     http_method_names = ('delete', 'get', 'patch', 'post')
+    pagination_class = PubDatePagination
+    sparse_defer_fields = ('text',)
+    fast_list_serializer_class = FastListSerializer
 
-    def get_title(self):
-        return get_object_or_404(
-            Title,
-            pk=self.kwargs.get('title_id')
-        )
+    parent_model = Title
+    parent_url_kwargs = {'pk': 'title_id'}
+    parent_field = 'title'
 
-    def get_queryset(self):
-        return self.get_title().reviews.all()
+    def get_version_namespaces(self):
+        return (f'reviews:{self.kwargs.get("title_id")}', 'users')
 
     def perform_create(self, serializer):
-        serializer.save(
-            title=self.get_title(),
-            author=self.request.user
-        )
-
-
-class CommentViewSet(viewsets.ModelViewSet):
+        # Произведение не загружается: его наличие проверяет
+        # обновление рейтинга в Review.save.
+        try:
+            serializer.save(
+                title_id=self.kwargs.get('title_id'),
+                author=self.request.user
+            )
+        except Title.DoesNotExist:
+            raise Http404
+
+
+class CommentViewSet(
+    NestedParentMixin,
+    ConditionalListRetrieveMixin,
+    FastListMixin,
+    SparseFieldsetMixin,
+    StreamingListMixin,
+    viewsets.ModelViewSet
+):
     """Вьюсет для комментариев."""
 
-    queryset = Comments.objects.all()
+    queryset = Comments.objects.select_related('author')
     serializer_class = CommentSerializer
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsAdminModeratorOwnerOrReadOnly
     )
     http_method_names = ('get', 'post', 'patch', 'delete')
+    pagination_class = PubDatePagination
+    sparse_defer_fields = ('text',)
+    fast_list_serializer_class = FastListSerializer
 
-    def get_review(self):
-        return get_object_or_404(
-            Review,
-            pk=self.kwargs.get('review_id'),
-            title=self.kwargs.get('title_id')
-        )
+    parent_model = Review
+    parent_url_kwargs = {'pk': 'review_id', 'title': 'title_id'}
+    parent_field = 'review'
 
-    def get_queryset(self):
-        return self.get_review().comments.all()
+    def get_version_namespaces(self):
+        return (f'comments:{self.kwargs.get("review_id")}', 'users')
 
     def perform_create(self, serializer):
         serializer.save(
-            review=self.get_review(),
+            review=self.get_parent(),
             author=self.request.user
         )
 
@@ -114,7 +225,10 @@ class CommentViewSet(viewsets.ModelViewSet):
 class SignUpViewSet(viewsets.ViewSet):
     """Вьюсет для регистрации пользователей."""
 
+    # Без аутентификации: лишний запрос тротлинга не должен доходить до БД.
+    authentication_classes = ()
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = (SignUpIPThrottle, SignUpIdentityThrottle)
 
     def create(self, request):
         """Регистрация пользователя и повторная отправка кода."""
@@ -129,21 +243,60 @@ class SignUpViewSet(viewsets.ViewSet):
 
 # Создадим вью-функцию для получения JWT-токена по коду подтверждения
 @api_view(['POST'])
+@authentication_classes([])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([TokenIPThrottle, TokenIdentityThrottle])
 def token_obtain_view(request):
     """Вью-функция для получения JWT-токена по коду подтверждения."""
 
     # Создаем сериализатор
     serializer = TokenObtainSerializer(data=request.data)
 
-    # Проверяем, что данные валидны
+    # Проверяем, что данные валидны, и выпускаем токен
     serializer.is_valid(raise_exception=True)
-    serializer.create(serializer.validated_data)
     serializer.save()
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+@renderer_classes([NDJSONRenderer, CSVRenderer])
+def export_view(request, dataset):
+    """Потоковая выгрузка titles, reviews или comments.
+
+    Формат - ?format=ndjson|csv (или заголовок Accept), ?since= -
+    только изменённые (произведения) или опубликованные (отзывы,
+    комментарии) начиная с даты, ?gzip=1 - сжатый файл.
+    """
+    if dataset not in DATASETS:
+        raise NotFound(f'Неизвестный набор данных: {dataset}.')
+    since = request.query_params.get('since')
+    if since:
+        try:
+            since = parse_since(since)
+        except ValueError as error:
+            raise ValidationError({'since': [str(error)]})
+    else:
+        since = None
+    compress = request.query_params.get('gzip') in ('1', 'true')
+    renderer = request.accepted_renderer
+    filename = f'{dataset}.{renderer.format}'
+    if compress:
+        content_type = 'application/gzip'
+        filename += '.gz'
+    else:
+        content_type = renderer.media_type
+    response = StreamingHttpResponse(
+        export(dataset, renderer.format, since, compress),
+        content_type=content_type
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+class UserViewSet(
+    SparseFieldsetMixin, StreamingListMixin, viewsets.ModelViewSet
+):
     """Вьюсет для работы с пользователями."""
 
     # Права доступа есть только у администратора.
@@ -157,6 +310,7 @@ class UserViewSet(viewsets.ModelViewSet):
     pagination_class = LimitOffsetPagination
     search_fields = ('=username',)
     lookup_field = 'username'
+    sparse_defer_fields = ('bio',)
 
     @action(
         detail=False,
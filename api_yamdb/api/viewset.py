@@ -1,9 +1,12 @@
 from rest_framework import filters, mixins, viewsets
 
+from api.mixins import ConditionalListMixin
 from api.permissions import IsAdminOrReadOnly
+from api.taxonomy import get_taxonomy
 
 
 class CategoryGenreViewSet(
+        ConditionalListMixin,
         mixins.CreateModelMixin,
         mixins.ListModelMixin,
         mixins.DestroyModelMixin,
@@ -15,3 +18,17 @@ class CategoryGenreViewSet(
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    # Атрибут кеша справочников (api/taxonomy.py) со списком объектов.
+    taxonomy_attr = None
+
+    def filter_queryset(self, queryset):
+        if self.action != 'list':
+            return super().filter_queryset(queryset)
+        # Список отдаётся из кеша справочников, поиск - по тем же
+        # правилам, что у SearchFilter: каждое слово входит в название.
+        objects = getattr(get_taxonomy(self.request), self.taxonomy_attr)
+        terms = filters.SearchFilter().get_search_terms(self.request)
+        return [
+            obj for obj in objects
+            if all(term.lower() in obj.name.lower() for term in terms)
+        ]
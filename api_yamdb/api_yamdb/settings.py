@@ -71,6 +71,39 @@ DATABASES = {
 }
 
 
+# Cache
+# Для нескольких воркеров нужен общий кеш, например:
+# 'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+# 'LOCATION': BASE_DIR / 'cache',
+# или 'django.core.cache.backends.db.DatabaseCache' с 'LOCATION': 'cache'
+# (таблица создаётся командой python manage.py createcachetable).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yamdb',
+    }
+}
+
+# Алиас из CACHES и время жизни (в секундах) кеша ответов API.
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = 60 * 15
+
+# Списки не короче API_STREAM_MIN_ITEMS элементов отдаются потоком,
+# массив results кодируется частями по API_STREAM_CHUNK_SIZE.
+API_STREAM_MIN_ITEMS = 500
+API_STREAM_CHUNK_SIZE = 100
+
+# Алиас из CACHES для корзин тротлинга, общих для всех воркеров.
+# None - корзины в памяти каждого процесса.
+API_THROTTLE_CACHE_ALIAS = None
+
+# Размер кешей проверенных токенов и пользователей аутентификации
+# (в каждом процессе) и время жизни записей в секундах.
+API_AUTH_CACHE_SIZE = 10000
+API_AUTH_CACHE_TTL = 60
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -109,14 +142,28 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
 
+    # Частоты корзин токенов из api.throttling: <scope>_ip и
+    # <scope>_identity (по username и email из запроса).
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': '20/min',
+        'signup_identity': '5/min',
+        'token_ip': '30/min',
+        'token_identity': '10/min',
+    },
+
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
 
@@ -134,3 +181,8 @@ AUTH_USER_MODEL = 'users.User'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 DEFAULT_FROM_EMAIL = 'noreply@yamdb.fake'
+# Письма ставятся в очередь в БД и отправляются командой
+# python manage.py send_emails --loop. С EMAIL_QUEUE_EAGER письмо
+# отправляется в том же запросе сразу после записи в очередь
+# (так работают тесты, см. tests/conftest.py).
+EMAIL_QUEUE_EAGER = False
@@ -5,3 +5,8 @@ MAX_SLUG_LENGTH = 50
 MAX_SCORE = 10
 MIN_SCORE = 1
 TEXT_SLICE = 10
+TOP_TITLES_LIMIT = 20
+TOP_TITLES_MAX_LIMIT = 100
+BULK_CHUNK_SIZE = 500
+BULK_MAX_ITEMS = 10000
+EXPORT_CHUNK_SIZE = 2000
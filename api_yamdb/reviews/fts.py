@@ -0,0 +1,101 @@
+"""Полнотекстовый индекс произведений (SQLite FTS5).
+
+Индекс с внешним содержимым: данные хранятся в reviews_title,
+а reviews_title_fts поддерживается триггерами, поэтому синхронизируется
+и при bulk_create/update(). Токенизатор unicode61 не считает «ё»
+вариантом «е», поэтому текст нормализуется перед индексацией
+(и в запросе, см. TitleQuerySet.search).
+
+SQLite пересоздаёт таблицу при AddField/AlterField, и триггеры
+при этом удаляются. Миграции, изменяющие reviews_title, должны
+заканчиваться вызовом create_triggers.
+"""
+
+TRIGGER_NAMES = (
+    'reviews_title_fts_insert',
+    'reviews_title_fts_delete',
+    'reviews_title_fts_update',
+)
+
+
+def normalized(column):
+    return f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+NEW_VALUES = (
+    f"new.id, {normalized('new.name')}, {normalized('new.description')}"
+)
+OLD_VALUES = (
+    f"old.id, {normalized('old.name')}, {normalized('old.description')}"
+)
+
+CREATE_TABLE_SQL = """
+    CREATE VIRTUAL TABLE reviews_title_fts USING fts5(
+        name, description,
+        content='reviews_title', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+FILL_TABLE_SQL = f"""
+    INSERT INTO reviews_title_fts(rowid, name, description)
+    SELECT id, {normalized('name')}, {normalized('description')}
+    FROM reviews_title
+"""
+
+CREATE_TRIGGERS_SQL = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS reviews_title_fts_insert
+    AFTER INSERT ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES ({NEW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS reviews_title_fts_delete
+    AFTER DELETE ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name,
+                                      description)
+        VALUES ('delete', {OLD_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS reviews_title_fts_update
+    AFTER UPDATE OF name, description ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name,
+                                      description)
+        VALUES ('delete', {OLD_VALUES});
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES ({NEW_VALUES});
+    END
+    """,
+)
+
+
+def create_triggers(apps, schema_editor):
+    """Создаёт триггеры синхронизации индекса (идемпотентно)."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_TRIGGERS_SQL:
+        schema_editor.execute(sql)
+
+
+def create_index(apps, schema_editor):
+    """Создаёт и заполняет индекс вместе с триггерами."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_TABLE_SQL)
+    schema_editor.execute(FILL_TABLE_SQL)
+    create_triggers(apps, schema_editor)
+
+
+def drop_index(apps, schema_editor):
+    """Удаляет индекс и триггеры."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for name in TRIGGER_NAMES:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {name}')
+    schema_editor.execute('DROP TABLE IF EXISTS reviews_title_fts')
@@ -9,6 +9,7 @@ from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
 
 from reviews.models import Category, Comments, Genre, Review, Title
+from reviews.signals import ratings_rebuilt
 
 User = get_user_model()
 
@@ -105,3 +106,8 @@ class Command(BaseCommand):
             genre = Genre.objects.get(id=row['genre_id'])
             title = Title.objects.get(id=row['title_id'])
             title.genre.add(genre)
+
+        # Счётчики рейтинга пересчитываем целиком: при повторном импорте
+        # отзывы с теми же id обновляются, а не добавляются.
+        Title.objects.rebuild_ratings()
+        ratings_rebuilt.send(sender=Title)
@@ -0,0 +1,19 @@
+"""Модуль для пересчёта рейтингов произведений."""
+
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+from reviews.signals import ratings_rebuilt
+
+
+class Command(BaseCommand):
+    """
+    Команда для пересчёта суммы оценок и количества отзывов
+    у всех произведений: python manage.py rebuild_ratings
+    """
+    help = "Rebuilding title ratings from reviews."
+
+    def handle(self, *args, **options):
+        updated = Title.objects.rebuild_ratings()
+        ratings_rebuilt.send(sender=Title)
+        self.stdout.write(f'Обновлено произведений: {updated}')
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from reviews import fts
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_review_comment_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(fts.create_index, fts.drop_index),
+    ]
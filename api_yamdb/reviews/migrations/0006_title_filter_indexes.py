@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_fts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year'], name='title_year_idx'),
+        ),
+        # Автоматическая таблица связи индексирована по (title_id, genre_id);
+        # для выборки произведений по жанру нужен обратный порядок.
+        migrations.RunSQL(
+            'CREATE INDEX reviews_title_genre_genre_title_idx '
+            'ON reviews_title_genre (genre_id, title_id)',
+            'DROP INDEX reviews_title_genre_genre_title_idx',
+        ),
+    ]
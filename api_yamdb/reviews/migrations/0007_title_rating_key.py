@@ -0,0 +1,43 @@
+# Generated by Django 3.2 on 2026-10-18 18:41
+
+from django.db import migrations, models
+from django.db.models import ExpressionWrapper, F, FloatField
+from django.db.models.functions import Cast
+
+from reviews import fts
+
+
+def fill_rating_key(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.filter(reviews_count__gt=0).update(
+        rating_key=ExpressionWrapper(
+            Cast(F('score_sum'), FloatField()) / F('reviews_count'),
+            output_field=FloatField()
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_key',
+            field=models.FloatField(default=0, editable=False, verbose_name='Ключ сортировки по рейтингу'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating_key'], name='title_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['reviews_count'], name='title_reviews_count_idx'),
+        ),
+        migrations.RunPython(fill_rating_key, migrations.RunPython.noop),
+        # AddField на SQLite пересоздаёт таблицу и удаляет триггеры FTS.
+        migrations.RunPython(fts.create_triggers, migrations.RunPython.noop),
+    ]
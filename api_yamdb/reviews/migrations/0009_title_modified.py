@@ -0,0 +1,26 @@
+# Generated by Django 3.2 on 2026-10-18 19:00
+
+from django.db import migrations, models
+
+from reviews import fts
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_taxonomy_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['modified'], name='title_modified_idx'),
+        ),
+        # AddField на SQLite пересоздаёт таблицу и удаляет триггеры FTS.
+        migrations.RunPython(fts.create_triggers, migrations.RunPython.noop),
+    ]
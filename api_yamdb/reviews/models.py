@@ -1,8 +1,14 @@
 """Модель отзывов."""
 
+import re
+from uuid import uuid4
+
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import (Case, Count, ExpressionWrapper, F, FloatField,
+                              OuterRef, Q, Subquery, Sum, Value, When)
+from django.db.models.functions import Cast, Coalesce, Now
 
 from reviews.constants import (MAX_NAME_LENGTH, MAX_SCORE, MAX_SLUG_LENGTH,
                                MIN_SCORE, TEXT_SLICE)
@@ -46,6 +52,153 @@ class Genre(CategoryGenreBaseModel):
         verbose_name_plural = 'жанры'
 
 
+class TaxonomyVersion(models.Model):
+    """Версия справочников жанров и категорий (единственная строка).
+
+    Меняется при любом изменении жанров и категорий; по ней процессы
+    проверяют актуальность своего кеша справочников.
+    """
+
+    version = models.CharField(max_length=32, verbose_name='Версия')
+
+    class Meta:
+        verbose_name = 'Версия справочников'
+        verbose_name_plural = 'Версии справочников'
+
+    def __str__(self):
+        return self.version
+
+    @classmethod
+    def get_current(cls):
+        return cls.objects.filter(pk=1).values_list(
+            'version', flat=True
+        ).first()
+
+    @classmethod
+    def bump(cls):
+        # Случайное значение, а не счётчик: версия не повторится
+        # и после пересоздания базы.
+        cls.objects.update_or_create(
+            pk=1, defaults={'version': uuid4().hex}
+        )
+
+
+class TitleQuerySet(models.QuerySet):
+    """QuerySet произведений."""
+
+    def search(self, text):
+        """Полнотекстовый поиск по названию и описанию.
+
+        На SQLite используется индекс FTS5 (см. reviews/fts.py):
+        слова ищутся по префиксу, результаты ранжируются bm25,
+        совпадения в названии весят больше, чем в описании.
+        Буква «ё» приравнивается к «е», как и при индексации.
+        """
+        words = re.findall(r'\w+', text.replace('ё', 'е').replace('Ё', 'Е'))
+        if not words:
+            return self.none()
+        if connections[self.db].vendor != 'sqlite':
+            condition = Q()
+            for word in words:
+                condition &= (
+                    Q(name__icontains=word) | Q(description__icontains=word)
+                )
+            return self.filter(condition)
+        return self.extra(
+            select={'search_rank': 'bm25(reviews_title_fts, 10.0, 1.0)'},
+            tables=['reviews_title_fts'],
+            where=[
+                'reviews_title_fts.rowid = reviews_title.id',
+                'reviews_title_fts MATCH %s',
+            ],
+            params=[' '.join(f'"{word}"*' for word in words)],
+            order_by=['search_rank'],
+        )
+
+    def leaderboards(self, limit):
+        """Лучшие по рейтингу произведения в каждом жанре и категории.
+
+        Возвращает два словаря {id жанра/категории: [id произведений]}.
+        Сортировка идёт по индексируемому ключу rating_key, поэтому
+        оценки отзывов заново не агрегируются. Фильтры queryset
+        не учитываются: рейтинги строятся по всему каталогу.
+        """
+        title_table = Title._meta.db_table
+        genre_table = Title.genre.through._meta.db_table
+        ranked_sql = (
+            'SELECT group_id, title_id FROM ('
+            '  SELECT {group} AS group_id, title.id AS title_id,'
+            '  ROW_NUMBER() OVER ('
+            '    PARTITION BY {group}'
+            '    ORDER BY title.rating_key DESC, title.id'
+            '  ) AS position'
+            '  FROM {tables}'
+            '  WHERE title.reviews_count > 0 AND {group} IS NOT NULL'
+            ') AS ranked WHERE position <= %s ORDER BY group_id, position'
+        )
+        queries = (
+            ranked_sql.format(
+                group='link.genre_id',
+                tables=(
+                    f'{genre_table} link JOIN {title_table} title '
+                    'ON title.id = link.title_id'
+                ),
+            ),
+            ranked_sql.format(
+                group='title.category_id', tables=f'{title_table} title'
+            ),
+        )
+        result = []
+        with connections[self.db].cursor() as cursor:
+            for sql in queries:
+                boards = {}
+                cursor.execute(sql, [limit])
+                for group_id, title_id in cursor.fetchall():
+                    boards.setdefault(group_id, []).append(title_id)
+                result.append(boards)
+        return result
+
+    def update_rating(self, score_delta, count_delta=0):
+        """Изменяет счётчики рейтинга и ключ сортировки на разницу.
+
+        В UPDATE правые части вычисляются по старым значениям строки,
+        поэтому ключ сортировки считается от уже изменённых счётчиков.
+        """
+        score_sum = F('score_sum') + score_delta
+        reviews_count = F('reviews_count') + count_delta
+        return self.update(
+            score_sum=score_sum,
+            reviews_count=reviews_count,
+            modified=Now(),
+            rating_key=Case(
+                When(reviews_count=-count_delta, then=Value(0.0)),
+                default=ExpressionWrapper(
+                    Cast(score_sum, FloatField()) / reviews_count,
+                    output_field=FloatField()
+                ),
+                output_field=FloatField()
+            ),
+        )
+
+    def rebuild_ratings(self):
+        """Пересчитывает счётчики рейтинга и ключ сортировки с нуля."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        updated = self.update(
+            score_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            reviews_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0
+            ),
+        )
+        self.update_rating(0)
+        return updated
+
+
 class Title(models.Model):
     """Модель произведений."""
 
@@ -64,8 +217,35 @@ class Title(models.Model):
         Category, on_delete=models.SET_NULL,
         null=True
     )
+    # Сумма оценок и количество отзывов поддерживаются при изменении
+    # отзывов, чтобы не считать Avg('reviews__score') на каждый запрос.
+    score_sum = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Сумма оценок'
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество отзывов'
+    )
+    # Средняя оценка (0 без отзывов) - индексируемый ключ сортировки.
+    rating_key = models.FloatField(
+        default=0, editable=False, verbose_name='Ключ сортировки по рейтингу'
+    )
+    # Время последнего изменения, включая рейтинг, - для выгрузок since=.
+    modified = models.DateTimeField(auto_now=True, verbose_name='Изменено')
+
+    objects = TitleQuerySet.as_manager()
+
+    # Поля, которые изменяются только через update_rating/rebuild_ratings.
+    RATING_FIELDS = ('score_sum', 'reviews_count', 'rating_key')
 
     class Meta:
+        indexes = [
+            models.Index(fields=('year',), name='title_year_idx'),
+            models.Index(fields=('rating_key',), name='title_rating_idx'),
+            models.Index(
+                fields=('reviews_count',), name='title_reviews_count_idx'
+            ),
+            models.Index(fields=('modified',), name='title_modified_idx'),
+        ]
         ordering = ('name',)
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
@@ -73,6 +253,24 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # Не перезаписываем счётчики рейтинга значениями, загруженными
+            # до параллельного изменения отзывов.
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def rating(self):
+        """Средняя оценка произведения или None, если отзывов нет."""
+        if not self.reviews_count:
+            return None
+        return self.score_sum / self.reviews_count
+
 
 class Review(models.Model):
     """Модель отзывов."""
@@ -123,12 +321,65 @@ class Review(models.Model):
                 name='unique_review'
             )
         ]
+        indexes = [
+            # Для keyset-пагинации отзывов произведения по (pub_date, id)
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        ]
         ordering = ('pub_date',)
 
     def __str__(self):
         """Возвращает текст отзыва."""
         return self.text
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запоминаем загруженные оценку и произведение, чтобы при
+        # сохранении обновить счётчики произведений на разницу.
+        instance._loaded_score = instance.__dict__.get('score')
+        instance._loaded_title_id = instance.__dict__.get('title_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Сохраняет отзыв и обновляет счётчики рейтинга произведения."""
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                if not Title.objects.filter(pk=self.title_id).update_rating(
+                    self.score, 1
+                ):
+                    # Произведения нет - вставка отзыва откатывается.
+                    raise Title.DoesNotExist(
+                        f'Произведение с id={self.title_id} не найдено.'
+                    )
+            else:
+                old_score = getattr(self, '_loaded_score', None)
+                old_title_id = getattr(self, '_loaded_title_id', None)
+                if old_score is None or old_title_id is None:
+                    # Исходные значения неизвестны (например, поле было
+                    # отложено) - пересчитываем счётчики произведений.
+                    Title.objects.filter(
+                        pk__in={self.title_id, old_title_id} - {None}
+                    ).rebuild_ratings()
+                elif old_title_id != self.title_id:
+                    # Отзыв перенесён к другому произведению (в админке).
+                    Title.objects.filter(pk=old_title_id).update_rating(
+                        -old_score, -1
+                    )
+                    Title.objects.filter(pk=self.title_id).update_rating(
+                        self.score, 1
+                    )
+                elif old_score != self.score:
+                    Title.objects.filter(pk=self.title_id).update_rating(
+                        self.score - old_score
+                    )
+        self._loaded_score = self.score
+        self._loaded_title_id = self.title_id
+
 
 class Comments(models.Model):
     """Модель комментариев."""
@@ -157,6 +408,13 @@ class Comments(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            # Для keyset-пагинации комментариев к отзыву по (pub_date, id)
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        ]
         ordering = ('pub_date',)
 
     def __str__(self):
@@ -0,0 +1,31 @@
+"""Сигналы приложения reviews."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from reviews.models import Category, Genre, Review, TaxonomyVersion, Title
+
+# Отправляется после массового пересчёта рейтингов через update(),
+# который не вызывает post_save у произведений.
+ratings_rebuilt = Signal()
+
+
+@receiver(post_delete, sender=Review)
+def decrease_title_rating(sender, instance, **kwargs):
+    """Вычитает удалённый отзыв из счётчиков рейтинга произведения.
+
+    Срабатывает и при каскадном удалении отзывов вместе с автором
+    или произведением: Django удаляет их в одной транзакции.
+    """
+    Title.objects.filter(pk=instance.title_id).update_rating(
+        -instance.score, -1
+    )
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_taxonomy_version(sender, **kwargs):
+    """Меняет версию справочников при изменении жанров и категорий."""
+    TaxonomyVersion.bump()
@@ -5,6 +5,15 @@ from django.db import models
 NAME_MAX_LENGTH = 150
 EMAIL_MAX_LENGTH = 254
 CONFIRMATION_CODE_LENGTH = 100
+EMAIL_SUBJECT_MAX_LENGTH = 255
+
+# Очередь писем: размер пачки, число попыток, задержка перед повтором
+# (удваивается с каждой попыткой) и время, на которое воркер забирает
+# пачку, в секундах.
+EMAIL_BATCH_SIZE = 100
+EMAIL_MAX_ATTEMPTS = 5
+EMAIL_RETRY_DELAY = 60
+EMAIL_LEASE = 300
 
 
 class Role(models.TextChoices):
@@ -0,0 +1,117 @@
+"""Очередь писем в БД.
+
+Запрос только добавляет письмо в таблицу OutgoingEmail; отправляет
+их воркер `python manage.py send_emails` пачками через одно
+соединение с почтовым сервером, повторяя неудачные попытки с
+нарастающей задержкой. При EMAIL_QUEUE_EAGER письмо отправляется
+сразу после фиксации транзакции, в которой оно поставлено в очередь.
+"""
+
+from contextlib import suppress
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from users.constants import (EMAIL_BATCH_SIZE, EMAIL_LEASE, EMAIL_MAX_ATTEMPTS,
+                             EMAIL_RETRY_DELAY)
+from users.models import OutgoingEmail
+
+
+def enqueue_email(subject, body, to, from_email=None):
+    """Ставит письмо в очередь и возвращает его запись."""
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        to=to,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL
+    )
+    if settings.EMAIL_QUEUE_EAGER:
+        transaction.on_commit(partial(send_queued, ids=[email.pk]))
+    return email
+
+
+def claim_batch(batch_size=EMAIL_BATCH_SIZE, ids=None):
+    """Забирает пачку писем, которые пора отправить.
+
+    Попытка засчитывается сразу, а следующая назначается через
+    EMAIL_LEASE: письма упавшего воркера вернутся в очередь, а другие
+    воркеры их не возьмут, пока эта попытка не закончится.
+    """
+    now = timezone.now()
+    pending = OutgoingEmail.objects.filter(
+        sent__isnull=True,
+        next_attempt__lte=now,
+        attempts__lt=EMAIL_MAX_ATTEMPTS
+    )
+    if ids is not None:
+        pending = pending.filter(pk__in=ids)
+    with transaction.atomic():
+        claimed = list(
+            pending.select_for_update(skip_locked=True)
+            .order_by('next_attempt', 'pk')[:batch_size]
+        )
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in claimed]
+        ).update(
+            attempts=F('attempts') + 1,
+            next_attempt=now + timedelta(seconds=EMAIL_LEASE)
+        )
+    for email in claimed:
+        email.attempts += 1
+    return claimed
+
+
+def deliver(emails, connection):
+    """Отправляет письма через открытое соединение.
+
+    Возвращает отправленные письма и {письмо: ошибка} для остальных.
+    """
+    sent, failed = [], {}
+    for email in emails:
+        message = EmailMessage(
+            email.subject, email.body, email.from_email, [email.to],
+            connection=connection
+        )
+        try:
+            message.send()
+        except Exception as error:
+            failed[email] = error
+        else:
+            sent.append(email)
+    return sent, failed
+
+
+def send_queued(batch_size=EMAIL_BATCH_SIZE, ids=None):
+    """Отправляет одну пачку писем; возвращает число отправленных."""
+    emails = claim_batch(batch_size, ids)
+    if not emails:
+        return 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        sent, failed = [], {email: error for email in emails}
+    else:
+        try:
+            sent, failed = deliver(emails, connection)
+        finally:
+            # Письма уже отправлены: ошибка закрытия их не касается.
+            with suppress(Exception):
+                connection.close()
+    now = timezone.now()
+    OutgoingEmail.objects.filter(
+        pk__in=[email.pk for email in sent]
+    ).update(sent=now, error='')
+    for email, error in failed.items():
+        OutgoingEmail.objects.filter(pk=email.pk).update(
+            error=repr(error),
+            next_attempt=now + timedelta(
+                seconds=EMAIL_RETRY_DELAY * 2 ** (email.attempts - 1)
+            )
+        )
+    return len(sent)
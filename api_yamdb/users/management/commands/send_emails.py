@@ -0,0 +1,41 @@
+"""Модуль воркера очереди писем."""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.constants import EMAIL_BATCH_SIZE
+from users.mail import send_queued
+
+
+class Command(BaseCommand):
+    """
+    Команда для отправки писем из очереди пачками:
+    python manage.py send_emails --loop
+    """
+    help = "Sending queued emails."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=EMAIL_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а ждать новые письма'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Пауза между проверками пустой очереди, в секундах'
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            sent = send_queued(options['batch_size'])
+            total += sent
+            if sent:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(f'Отправлено писем: {total}')
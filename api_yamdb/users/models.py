@@ -3,8 +3,10 @@
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.tokens import default_token_generator
 from django.db import models
+from django.utils import timezone
 
-from users.constants import EMAIL_MAX_LENGTH, NAME_MAX_LENGTH, Role
+from users.constants import (EMAIL_MAX_LENGTH, EMAIL_SUBJECT_MAX_LENGTH,
+                             NAME_MAX_LENGTH, Role)
 from users.validators import validate_username
 
 
@@ -38,6 +40,18 @@ class User(AbstractUser):
     def __str__(self):
         return f'user: {self.username} email: {self.email}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Кеш ответов с username авторов сбрасывается, только если
+        # username изменился (api.signals).
+        instance._loaded_username = instance.__dict__.get('username')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_username = self.username
+
     # Методы для проверки ролей
     # Добавим is_superuser и is_staff, а Role.ADMIN возьмём из модели Roles
     @property
@@ -60,3 +74,34 @@ class User(AbstractUser):
     def check_confirmation_code(self, code):
         """Проверяет код с использованием default_token_generator."""
         return default_token_generator.check_token(self, code)  # было проще
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку."""
+
+    subject = models.CharField('Тема', max_length=EMAIL_SUBJECT_MAX_LENGTH)
+    body = models.TextField('Текст')
+    from_email = models.EmailField('Отправитель', max_length=EMAIL_MAX_LENGTH)
+    to = models.EmailField('Получатель', max_length=EMAIL_MAX_LENGTH)
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    next_attempt = models.DateTimeField(
+        'Следующая попытка', default=timezone.now
+    )
+    sent = models.DateTimeField('Отправлено', null=True, blank=True)
+    error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Очередь писем'
+        indexes = [
+            # Воркер выбирает только неотправленные письма.
+            models.Index(
+                fields=('next_attempt',),
+                name='email_pending_idx',
+                condition=models.Q(sent__isnull=True)
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.to}: {self.subject}'
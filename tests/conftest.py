@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+from django.conf import settings
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -32,4 +34,26 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_cache',
 ]
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(tmp_path_factory):
+    """Тестовая БД в файле, а не в памяти.
+
+    Общая SQLite в памяти не ждёт снятия блокировок, и параллельные
+    запросы из разных потоков падают с `database table is locked`.
+    """
+    settings.DATABASES['default']['TEST'].update({
+        'NAME': str(tmp_path_factory.mktemp('db') / 'test.sqlite3')
+    })
+
+
+@pytest.fixture(autouse=True)
+def eager_email_queue(settings):
+    """Письма отправляются сразу, без воркера очереди.
+
+    Тесты регистрации проверяют mail.outbox сразу после запроса.
+    """
+    settings.EMAIL_QUEUE_EAGER = True
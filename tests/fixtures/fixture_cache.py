@@ -0,0 +1,17 @@
+import pytest
+from django.core.cache import caches
+
+from api.authentication import token_cache, user_cache
+from api.throttling import local_store
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Между тестами база очищается без сигналов, поэтому
+    # закешированные ответы прошлых тестов сбрасываем явно.
+    for cache in caches.all():
+        cache.clear()
+    local_store.clear()
+    user_cache.clear()
+    token_cache.clear()
+    yield
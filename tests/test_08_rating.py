@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Barrier
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08RatingCounters:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_counters_follow_reviews(self, client, admin_client,
+                                        user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что рейтинг произведения без отзывов равен `None`.'
+        )
+
+        create_single_review(admin_client, title_id, 'text', 2)
+        review = create_single_review(user_client, title_id, 'text', 8)
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг пересчитывается при создании отзыва.'
+        )
+
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review.json()['id']
+        )
+        user_client.patch(review_url, data={'score': 10})
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг пересчитывается при изменении оценки.'
+        )
+
+        moderator_client.delete(review_url)
+        assert self.get_rating(client, title_id) == 2, (
+            'Проверьте, что рейтинг пересчитывается при удалении отзыва.'
+        )
+
+    def test_02_cascade_and_rebuild(self, client, admin_client, user,
+                                    user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'text', 3)
+        create_single_review(user_client, title_id, 'text', 9)
+
+        user.delete()
+        assert self.get_rating(client, title_id) == 3, (
+            'Проверьте, что рейтинг пересчитывается при каскадном '
+            'удалении отзывов вместе с автором.'
+        )
+
+        Review.objects.update(score=7)
+        Title.objects.update(score_sum=0, reviews_count=0)
+        call_command('rebuild_ratings')
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.reviews_count) == (7, 1), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'счётчики рейтинга с нуля.'
+        )
+
+    def test_03_parallel_duplicate_reviews(self, admin_client, token_user):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        workers = 8
+        barrier = Barrier(workers)
+
+        def post(score):
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}'
+            )
+            barrier.wait()
+            try:
+                return client.post(url, data={'text': 'text', 'score': score})
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(workers) as executor:
+            responses = list(executor.map(post, range(1, workers + 1)))
+        statuses = sorted(response.status_code for response in responses)
+        assert statuses == [HTTPStatus.CREATED] + (
+            [HTTPStatus.BAD_REQUEST] * (workers - 1)
+        ), (
+            'Проверьте, что из параллельных повторных отзывов создаётся '
+            'ровно один, а остальные получают ответ 400.'
+        )
+        rejected = next(
+            response for response in responses
+            if response.status_code == HTTPStatus.BAD_REQUEST
+        )
+        assert rejected.json() == {'non_field_errors': [
+            'Вы уже писали отзыв на данное произведение.'
+        ]}, (
+            'Проверьте, что ответ на повторный отзыв не изменился.'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.reviews_count, Review.objects.count()) == (1, 1), (
+            'Проверьте, что отклонённые отзывы не меняют счётчики рейтинга.'
+        )
+
+    def test_04_review_create_without_lookup(self, admin_client,
+                                             user_client):
+        titles, _, _ = create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            response = create_single_review(
+                user_client, titles[0]['id'], 'text', 5
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        review_selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT "reviews_review"')
+        ]
+        assert not review_selects, (
+            'Проверьте, что повторный отзыв отсекается ограничением '
+            '`unique_review` в БД, а не отдельным запросом перед вставкой.'
+        )
+
+    def test_05_review_moved_to_another_title(self, admin_client, user,
+                                              user_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, first, 'text', 4)
+        review = Review.objects.get()
+        review.title_id = second
+        review.save()
+        counters = {
+            title.pk: (title.score_sum, title.reviews_count)
+            for title in Title.objects.filter(pk__in=(first, second))
+        }
+        assert counters == {first: (0, 0), second: (4, 1)}, (
+            'Проверьте, что при переносе отзыва к другому произведению '
+            'счётчики рейтинга обоих произведений пересчитываются.'
+        )
@@ -0,0 +1,297 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.mixins import FastListMixin
+from reviews.models import Comments, Review
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        return len(context.captured_queries)
+
+    def test_01_title_list_constant_queries(self, client, admin_client):
+        create_titles(admin_client)
+        one_title = self.count_queries(client, f'{self.TITLES_URL}?limit=1')
+        all_titles = self.count_queries(
+            client, f'{self.TITLES_URL}?limit=100'
+        )
+        assert one_title == all_titles, (
+            f'Проверьте, что количество запросов к БД для `{self.TITLES_URL}` '
+            'не зависит от размера страницы.'
+        )
+
+    def test_02_title_write_reuses_genres(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            admin_client.patch(
+                f'{self.TITLES_URL}{titles[0]["id"]}/',
+                data={'genre': [genres[2]['slug']]}
+            )
+        genre_selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and '"reviews_genre"."slug"' in query['sql']
+            and 'INNER JOIN "reviews_title_genre"' in query['sql']
+        ]
+        assert not genre_selects, (
+            'Проверьте, что ответ на PATCH-запрос к '
+            f'`{self.TITLES_URL}{{title_id}}/` использует уже полученные '
+            'жанры, а не запрашивает их повторно.'
+        )
+
+    def test_03_title_genres_resolved_in_one_query(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        slugs = [genre['slug'] for genre in genres]
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(
+                f'{self.TITLES_URL}{titles[0]["id"]}/',
+                data={'genre': slugs}
+            )
+        assert response.status_code == 200
+        genre_lookups = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_genre" WHERE' in query['sql']
+        ]
+        assert len(genre_lookups) <= 1, (
+            'Проверьте, что слаги жанров разрешаются не более чем '
+            'одним запросом.'
+        )
+
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            data={'genre': [slugs[0], 'unknown', 'missing']}
+        )
+        assert response.status_code == 400
+        assert 'unknown, missing' in response.json()['genre'][0], (
+            'Проверьте, что в ошибке перечислены неизвестные слаги.'
+        )
+
+        for genre in ([{}], [['drama']], [1]):
+            response = admin_client.patch(
+                f'{self.TITLES_URL}{titles[0]["id"]}/',
+                data={'genre': genre}, format='json'
+            )
+            assert response.status_code == 400, (
+                'Проверьте, что слаг не-строка в списке жанров приводит '
+                'к ответу 400.'
+            )
+
+    def test_04_taxonomy_served_from_memory(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        client.get('/api/v1/genres/')
+        for url in ('/api/v1/genres/', '/api/v1/categories/'):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == 200
+            assert len(context.captured_queries) == 1, (
+                f'Проверьте, что список `{url}` отдаётся из кеша '
+                'справочников после проверки версии одним запросом.'
+            )
+
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Новый', 'slug': 'new-genre'}
+        )
+        response = client.get('/api/v1/genres/?search=нов')
+        assert [genre['slug'] for genre in response.json()['results']] == [
+            'new-genre'
+        ], (
+            'Проверьте, что кеш справочников обновляется после изменения '
+            'жанров.'
+        )
+
+    def test_05_nested_parent_not_fetched(self, admin_client, admin,
+                                          user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        for url, parent_table in (
+            (reviews_url, 'reviews_title'),
+            (comments_url, 'reviews_review'),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = user_client.get(url)
+            assert response.status_code == 200
+            parent_selects = [
+                query['sql'] for query in context.captured_queries
+                if query['sql'].startswith(f'SELECT "{parent_table}"')
+            ]
+            assert not parent_selects, (
+                f'Проверьте, что список `{url}` фильтруется по аргументам '
+                'маршрута без отдельной загрузки родителя.'
+            )
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                f'{self.TITLES_URL}{titles[1]["id"]}/reviews/',
+                data={'text': 'Новый отзыв', 'score': 7}
+            )
+        assert response.status_code == 201
+        title_selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT "reviews_title"')
+        ]
+        assert not title_selects, (
+            'Проверьте, что при создании отзыва произведение не '
+            'загружается: его наличие проверяет обновление рейтинга.'
+        )
+
+        missing = f'{self.TITLES_URL}{max(t["id"] for t in titles) + 1}/'
+        assert user_client.get(f'{missing}reviews/').status_code == 404
+        response = user_client.post(
+            f'{missing}reviews/', data={'text': 'Отзыв', 'score': 5}
+        )
+        assert response.status_code == 404
+        assert user_client.get(
+            f'{reviews_url}{reviews[-1]["id"] + 1}/comments/'
+        ).status_code == 404
+        assert user_client.get(
+            f'{self.TITLES_URL}{titles[1]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        ).status_code == 404, (
+            'Проверьте, что комментарии к отзыву на другое произведение '
+            'недоступны.'
+        )
+
+    def test_06_authors_constant_queries(self, admin_client, user,
+                                         user_client, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        get_user_model().objects.bulk_create(
+            get_user_model()(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(1000)
+        )
+        authors = get_user_model().objects.filter(
+            username__startswith='author'
+        )
+        Review.objects.bulk_create(
+            Review(title_id=titles[0]['id'], author=author, text='text',
+                   score=5)
+            for author in authors
+        )
+        review = Review.objects.first()
+        Comments.objects.bulk_create(
+            Comments(review=review, author=author, text='text')
+            for author in authors
+        )
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        # Пользователь запроса попадает в кеш аутентификации.
+        user_client.get(reviews_url)
+
+        def count(url, limit):
+            with CaptureQueriesContext(connection) as context:
+                response = user_client.get(f'{url}?limit={limit}')
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            assert response.status_code == 200
+            return len(context.captured_queries)
+
+        for fast in (True, False):
+            if not fast:
+                monkeypatch.setattr(
+                    FastListMixin, 'list',
+                    lambda self, request, *args, **kwargs: super(
+                        FastListMixin, self
+                    ).list(request, *args, **kwargs)
+                )
+            for url in (reviews_url, comments_url):
+                counts = {limit: count(url, limit) for limit in (
+                    10, 100, 1000
+                )}
+                assert len(set(counts.values())) == 1, (
+                    f'Проверьте, что количество запросов к БД для `{url}` '
+                    'не зависит от числа авторов на странице: '
+                    f'{counts}.'
+                )
+
+        own_review = Review.objects.create(
+            title_id=titles[1]['id'], author=user, text='text', score=5
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(
+                f'{self.TITLES_URL}{titles[1]["id"]}/reviews/'
+                f'{own_review.id}/',
+                data={'text': 'new text'}
+            )
+        assert response.status_code == 200
+        user_selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT "users_user"')
+        ]
+        assert len(user_selects) <= 1, (
+            'Проверьте, что проверка прав на отзыв сравнивает `author_id` '
+            'и не загружает автора повторно.'
+        )
+
+    def test_07_signup_single_user_lookup(self, client):
+        url = '/api/v1/auth/signup/'
+        data = {'username': 'new_user', 'email': 'new_user@yamdb.fake'}
+
+        def user_queries():
+            with CaptureQueriesContext(connection) as context:
+                response = client.post(url, data=data)
+            return response, [
+                query['sql'] for query in context.captured_queries
+                if '"users_user"' in query['sql']
+            ]
+
+        for action in ('регистрации', 'повторном запросе кода'):
+            response, queries = user_queries()
+            assert response.status_code == 200
+            selects = [sql for sql in queries if sql.startswith('SELECT')]
+            assert len(selects) == 1, (
+                f'Проверьте, что при {action} пользователи с таким '
+                '`username` и `email` ищутся одним запросом.'
+            )
+        assert not any(sql.startswith('INSERT') for sql in queries), (
+            'Проверьте, что при повторном запросе кода пользователь '
+            'не создаётся.'
+        )
+
+        response = client.post(url, data={
+            'username': 'new_user', 'email': 'other@yamdb.fake'
+        })
+        assert response.json() == {
+            'username': ['Пользователь с таким username уже существует']
+        }
+
+    def test_08_token_single_user_lookup(self, client, user, monkeypatch):
+        issued = []
+        original_for_user = AccessToken.for_user.__func__
+        monkeypatch.setattr(AccessToken, 'for_user', classmethod(
+            lambda cls, user: issued.append(user) or original_for_user(
+                cls, user
+            )
+        ))
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/api/v1/auth/token/', data={
+                'username': user.username,
+                'confirmation_code': default_token_generator.make_token(user)
+            })
+        assert response.status_code == 200
+        assert set(response.json()) == {'token'}, (
+            'Проверьте, что в ответе на обмен кода приходит `token`.'
+        )
+        user_selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT "users_user"')
+        ]
+        assert len(user_selects) == 1 and len(issued) == 1, (
+            'Проверьте, что обмен кода на токен находит пользователя '
+            'одним запросом и выпускает токен один раз.'
+        )
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10KeysetPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def walk(self, client, url, link_key):
+        ids = []
+        pages = 0
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме курсора не выполняется подсчёт '
+                'количества объектов.'
+            )
+            ids.append([title['id'] for title in data['results']])
+            url = data[link_key]
+            pages += 1
+            assert pages < 50
+        return ids
+
+    def test_01_titles_cursor_walk(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {index % 4}', year=2000 + index % 3)
+            for index in range(23)
+        )
+        expected = list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+
+        pages = self.walk(client, f'{self.TITLES_URL}?cursor=&limit=5', 'next')
+        assert [title for page in pages for title in page] == expected, (
+            f'Проверьте, что `{self.TITLES_URL}?cursor=` возвращает все '
+            'произведения по порядку (name, id) без повторов и пропусков.'
+        )
+
+        last_page = client.get(
+            f'{self.TITLES_URL}?cursor=&limit=5'
+        ).json()
+        while last_page['next']:
+            last_page = client.get(last_page['next']).json()
+        backward = self.walk(client, last_page['previous'], 'previous')
+        backward_ids = [title for page in reversed(backward) for title in page]
+        assert backward_ids == expected[:-len(last_page['results'])], (
+            'Проверьте, что ссылка `previous` в режиме курсора возвращает '
+            'предыдущие страницы.'
+        )
+
+    def test_02_titles_cursor_with_filter(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {index}', year=2000 + index % 2)
+            for index in range(12)
+        )
+        expected = list(
+            Title.objects.filter(year=2001).order_by('name', 'id')
+            .values_list('id', flat=True)
+        )
+        pages = self.walk(
+            client, f'{self.TITLES_URL}?cursor=&limit=4&year=2001', 'next'
+        )
+        assert [title for page in pages for title in page] == expected
+
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        response = client.get(f'{self.TITLES_URL}?limit=4&offset=4')
+        assert response.json()['count'] == 12, (
+            'Проверьте, что пагинация limit/offset продолжает работать.'
+        )
+
+    def test_03_reviews_cursor_walk(self, client, django_user_model):
+        title = Title.objects.create(name='Произведение', year=2000)
+        django_user_model.objects.bulk_create(
+            django_user_model(username=f'user{index}',
+                              email=f'user{index}@yamdb.fake')
+            for index in range(13)
+        )
+        authors = django_user_model.objects.order_by('id')
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='text', score=5)
+            for author in authors
+        )
+        expected = list(
+            title.reviews.order_by('pub_date', 'id')
+            .values_list('id', flat=True)
+        )
+        url = f'/api/v1/titles/{title.id}/reviews/?cursor=&limit=4'
+        pages = self.walk(client, url, 'next')
+        assert [review for page in pages for review in page] == expected, (
+            'Проверьте, что `/api/v1/titles/{title_id}/reviews/?cursor=` '
+            'возвращает все отзывы по порядку (pub_date, id).'
+        )
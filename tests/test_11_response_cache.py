@@ -0,0 +1,74 @@
+from http import HTTPStatus
+from threading import Thread
+
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import TitleQuerySet
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_titles_served_from_cache(self, client, admin_client):
+        create_titles(admin_client)
+        url = f'{self.TITLES_URL}?limit=5&year=1984'
+        first = client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            second = client.get(f'{self.TITLES_URL}?year=1984&limit=5')
+        assert second.status_code == HTTPStatus.OK
+        assert second.json() == first.json()
+        assert not context.captured_queries, (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` '
+            'с теми же параметрами обслуживается из кеша.'
+        )
+
+    def test_02_cache_invalidated_on_write(self, client, admin_client,
+                                           user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+
+        create_single_review(user_client, titles[0]['id'], 'text', 7)
+        assert client.get(url).json()['rating'] == 7, (
+            'Проверьте, что кеш произведений сбрасывается при '
+            'создании отзыва.'
+        )
+
+        admin_client.patch(url, data={'name': 'Новое название'})
+        assert client.get(url).json()['name'] == 'Новое название', (
+            'Проверьте, что кеш произведений сбрасывается при '
+            'изменении произведения.'
+        )
+
+    def test_03_no_stale_entry_before_commit(self, client, admin_client,
+                                             user_client, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        original_update_rating = TitleQuerySet.update_rating
+
+        def get_in_other_thread():
+            try:
+                client.get(url)
+            finally:
+                connections.close_all()
+
+        def update_rating(queryset, *args, **kwargs):
+            updated = original_update_rating(queryset, *args, **kwargs)
+            # Параллельный GET, пока отзыв ещё не зафиксирован.
+            thread = Thread(target=get_in_other_thread)
+            thread.start()
+            thread.join()
+            return updated
+
+        monkeypatch.setattr(TitleQuerySet, 'update_rating', update_rating)
+        create_single_review(user_client, titles[0]['id'], 'text', 7)
+        assert client.get(url).json()['rating'] == 7, (
+            'Проверьте, что версия кеша меняется только после фиксации '
+            'транзакции, а не внутри неё.'
+        )
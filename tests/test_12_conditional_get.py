@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    @pytest.mark.parametrize('url', (
+        '/api/v1/titles/', '/api/v1/categories/', '/api/v1/genres/'
+    ))
+    def test_01_not_modified(self, client, admin_client, url):
+        create_titles(admin_client)
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag and response.get('Last-Modified'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+
+    def test_02_reviews_etag_changes(self, client, admin_client,
+                                     user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после добавления отзыва ответ на GET-запрос к '
+            f'`{url}` со старым `If-None-Match` возвращает статус 200.'
+        )
+        assert response['ETag'] != etag
+
+    def test_03_reviews_etag_and_users(self, client, admin_client, user,
+                                       user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        client.post('/api/v1/auth/signup/', data={
+            'username': 'newcomer', 'email': 'newcomer@yamdb.fake'
+        })
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'bio': 'Новое био'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что регистрация и изменение пользователя без смены '
+            'username не сбрасывают ETag отзывов.'
+        )
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'][0]['author'] == 'renamed', (
+            'Проверьте, что смена username автора сбрасывает ETag отзывов.'
+        )
@@ -0,0 +1,174 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, text):
+        response = client.get(self.TITLES_URL, {'search': text})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_prefix_cyrillic_and_rank(self, client):
+        Title.objects.create(
+            name='Ёжик в тумане', year=1975, description='Мультфильм'
+        )
+        Title.objects.create(
+            name='Сказка сказок', year=1979,
+            description='Волчок, ёжик и другие'
+        )
+        Title.objects.create(name='Терминатор', year=1984)
+
+        assert self.search(client, 'ЕЖИК') == [
+            'Ёжик в тумане', 'Сказка сказок'
+        ], (
+            'Проверьте, что поиск не зависит от регистра и буквы `ё`, '
+            'а совпадения в названии ранжируются выше.'
+        )
+        assert self.search(client, 'терм') == ['Терминатор'], (
+            'Проверьте, что поиск работает по префиксу слова.'
+        )
+        assert self.search(client, 'туман мульт') == ['Ёжик в тумане']
+        assert self.search(client, 'робокоп') == []
+
+    def test_02_index_follows_updates(self, client):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        Title.objects.filter(pk=title.pk).update(name='Робокоп')
+        assert self.search(client, 'робокоп') == ['Робокоп']
+        assert self.search(client, 'терминатор') == []
+        title.delete()
+        assert self.search(client, 'робокоп') == []
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def filter_names(self, client, params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return sorted(title['name'] for title in response.json()['results'])
+
+    def test_01_exact_multi_value_filters(self, client):
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        melodrama = Genre.objects.create(name='Мелодрама', slug='melodrama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        films = Category.objects.create(name='Фильм', slug='films')
+        books = Category.objects.create(name='Книга', slug='books')
+        for name, year, category, genres in (
+            ('A', 1990, films, (drama,)),
+            ('B', 2000, films, (melodrama,)),
+            ('C', 2010, books, (drama, comedy)),
+        ):
+            title = Title.objects.create(
+                name=name, year=year, category=category
+            )
+            title.genre.set(genres)
+
+        assert self.filter_names(client, {'genre': 'drama'}) == ['A', 'C'], (
+            'Проверьте, что фильтр по жанру сравнивает слаг точно.'
+        )
+        assert self.filter_names(
+            client, {'genre': 'drama,comedy'}
+        ) == ['A', 'C']
+        assert self.filter_names(
+            client, {'genre': 'drama,comedy', 'genre_mode': 'all'}
+        ) == ['C']
+        assert self.filter_names(
+            client, {'category': 'films,books', 'year_min': 1995,
+                     'year_max': 2010}
+        ) == ['B', 'C']
+        assert self.filter_names(client, {'category': 'film'}) == []
+
+    def test_02_ordering(self, client, django_user_model):
+        author = django_user_model.objects.create_user(
+            username='author', email='author@yamdb.fake'
+        )
+        critic = django_user_model.objects.create_user(
+            username='critic', email='critic@yamdb.fake'
+        )
+        scores = {'A': (4,), 'B': (10, 8), 'C': (), 'D': (6, 1)}
+        for index, (name, title_scores) in enumerate(scores.items()):
+            title = Title.objects.create(name=name, year=2000 - index)
+            for user, score in zip((author, critic), title_scores):
+                Review.objects.create(
+                    title=title, author=user, text='text', score=score
+                )
+
+        def ordered(ordering, **params):
+            response = client.get(
+                self.TITLES_URL, {'ordering': ordering, **params}
+            )
+            assert response.status_code == HTTPStatus.OK
+            return [title['name'] for title in response.json()['results']]
+
+        assert ordered('-rating') == ['B', 'A', 'D', 'C'], (
+            'Проверьте, что `ordering=-rating` сортирует произведения '
+            'по рейтингу по убыванию.'
+        )
+        assert ordered('year') == ['D', 'C', 'B', 'A']
+        assert ordered('-reviews_count,name') == ['B', 'D', 'A', 'C']
+        assert ordered('unknown') == ['A', 'B', 'C', 'D']
+
+        first = client.get(
+            self.TITLES_URL, {'ordering': '-rating', 'cursor': '', 'limit': 2}
+        ).json()
+        second = client.get(first['next']).json()
+        assert [title['name'] for title in second['results']] == ['D', 'C'], (
+            'Проверьте, что режим курсора учитывает параметр `ordering`.'
+        )
+
+    def test_03_top_leaderboards(self, client, django_user_model):
+        author = django_user_model.objects.create_user(
+            username='author', email='author@yamdb.fake'
+        )
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        films = Category.objects.create(name='Фильм', slug='films')
+        for name, score, genres in (
+            ('A', 5, (drama,)), ('B', 9, (drama, comedy)),
+            ('C', 7, (drama,)), ('D', None, (comedy,)),
+        ):
+            title = Title.objects.create(name=name, year=2000, category=films)
+            title.genre.set(genres)
+            if score:
+                Review.objects.create(
+                    title=title, author=author, text='text', score=score
+                )
+
+        response = client.get(f'{self.TITLES_URL}top/', {'limit': 2})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.TITLES_URL}top/` не найден.'
+        )
+        data = response.json()
+        boards = {
+            board['slug']: [title['name'] for title in board['titles']]
+            for board in data['genres'] + data['categories']
+        }
+        assert boards == {
+            'drama': ['B', 'C'], 'comedy': ['B'], 'films': ['B', 'C']
+        }, (
+            f'Проверьте, что `{self.TITLES_URL}top/` возвращает лучшие по '
+            'рейтингу произведения каждого жанра и категории.'
+        )
+        assert data['genres'][0]['titles'][0]['rating'] == 9
+
+        with CaptureQueriesContext(connection) as context:
+            client.get(f'{self.TITLES_URL}top/', {'limit': 3})
+        assert not [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "reviews_genre"' in query['sql']
+            or 'FROM "reviews_category"' in query['sql']
+        ], (
+            'Проверьте, что жанры и категории рейтингов берутся из кеша '
+            'справочников.'
+        )
@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Title
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleBulk:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_permissions(self, client, user_client):
+        for api_client, expected in (
+            (client, HTTPStatus.UNAUTHORIZED),
+            (user_client, HTTPStatus.FORBIDDEN),
+        ):
+            response = api_client.post(
+                self.BULK_URL, '[]', content_type='application/json'
+            )
+            assert response.status_code == expected
+
+    def test_02_bulk_create_and_update(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        existing = Title.objects.create(name='Старое', year=1990)
+        existing.genre.set([])
+        payload = [
+            {'name': f'Фильм {index}', 'year': 2000 + index,
+             'genre': [genres[0]['slug'], genres[1]['slug']],
+             'category': categories[0]['slug']}
+            for index in range(3)
+        ] + [
+            {'id': existing.id, 'name': 'Новое',
+             'genre': [genres[2]['slug']]},
+            {'name': 'Без жанра', 'year': 2000, 'genre': ['unknown'],
+             'category': categories[0]['slug']},
+            {'id': 100500, 'name': 'Нет такого'},
+            {'name': 'Без года', 'genre': [genres[0]['slug']],
+             'category': categories[0]['slug']},
+        ]
+        response = admin_client.post(self.BULK_URL, payload, format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert [item['index'] for item in data['results']] == [0, 1, 2, 3]
+        assert [item['index'] for item in data['errors']] == [4, 5, 6]
+        assert 'genre' in data['errors'][0]['errors']
+        assert 'id' in data['errors'][1]['errors']
+        assert 'year' in data['errors'][2]['errors']
+
+        title = Title.objects.get(pk=data['results'][1]['id'])
+        assert title.category.slug == categories[0]['slug']
+        assert sorted(title.genre.values_list('slug', flat=True)) == sorted(
+            [genres[0]['slug'], genres[1]['slug']]
+        )
+        existing.refresh_from_db()
+        assert existing.name == 'Новое'
+        assert list(existing.genre.values_list('slug', flat=True)) == [
+            genres[2]['slug']
+        ]
+
+    def test_03_bulk_repeated_id(self, admin_client):
+        genres = create_genre(admin_client)
+        existing = Title.objects.create(name='Старое', year=1990)
+        payload = [
+            {'id': existing.id, 'genre': [genres[0]['slug']]},
+            {'id': existing.id, 'genre': [genres[0]['slug']]},
+        ]
+        response = admin_client.post(self.BULK_URL, payload, format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что повторный `id` в одном запросе к '
+            f'`{self.BULK_URL}` возвращает ошибку элемента, а не 500.'
+        )
+        data = response.json()
+        assert [item['index'] for item in data['results']] == [0]
+        assert [item['index'] for item in data['errors']] == [1]
+        assert 'id' in data['errors'][0]['errors']
+        assert list(existing.genre.values_list('slug', flat=True)) == [
+            genres[0]['slug']
+        ]
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15SparseFieldsets:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_with_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_01_title_fields(self, client, admin_client):
+        create_titles(admin_client)
+        response, queries = self.get_with_queries(
+            client, f'{self.TITLES_URL}?fields=id,name,rating'
+        )
+        assert response.status_code == HTTPStatus.OK
+        for title in response.json()['results']:
+            assert list(title) == ['id', 'name', 'rating'], (
+                f'Проверьте, что `{self.TITLES_URL}?fields=` оставляет в '
+                'ответе только перечисленные поля.'
+            )
+        assert not [sql for sql in queries if '"description"' in sql], (
+            'Проверьте, что столбец description не читается из БД, '
+            'если поле не запрошено.'
+        )
+        assert not [sql for sql in queries if 'reviews_title_genre' in sql], (
+            'Проверьте, что связи с жанрами не читаются из БД, '
+            'если поле genre не запрошено.'
+        )
+
+        response = client.get(f'{self.TITLES_URL}?omit=description,genre')
+        for title in response.json()['results']:
+            assert list(title) == ['id', 'name', 'year', 'rating', 'category']
+
+    def test_02_unknown_fields(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(f'{self.TITLES_URL}?fields=id,secret')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос неизвестного поля возвращает ответ '
+            'со статусом 400.'
+        )
+        assert 'secret' in response.json()['fields'][0]
+
+    def test_03_reviews_and_comments(self, admin_client, admin, user_client,
+                                     user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        response, queries = self.get_with_queries(
+            admin_client, f'{reviews_url}?omit=text'
+        )
+        assert response.status_code == HTTPStatus.OK
+        for review in response.json()['results']:
+            assert 'text' not in review and 'score' in review
+        assert not [
+            sql for sql in queries
+            if 'FROM "reviews_review"' in sql and '"text"' in sql
+        ], (
+            'Проверьте, что текст отзывов не читается из БД, '
+            'если поле text исключено.'
+        )
+
+        response = admin_client.get(
+            f'{reviews_url}{reviews[0]["id"]}/comments/?fields=id,author'
+        )
+        assert [list(comment) for comment in response.json()['results']] == [
+            ['id', 'author']
+        ] * len(comments)
+
+    def test_04_users_and_writes(self, admin_client):
+        response = admin_client.get('/api/v1/users/?fields=username,role')
+        assert response.status_code == HTTPStatus.OK
+        for user in response.json()['results']:
+            assert list(user) == ['username', 'role']
+
+        response = admin_client.post(
+            f'{self.TITLES_URL}?fields=id', data={'name': 'x', 'year': 2000}
+        )
+        assert 'fields' not in response.json(), (
+            'Проверьте, что параметры fields/omit не влияют на запись.'
+        )
+
+    def test_05_review_detail(self, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        response = admin_client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/?fields=score'
+        )
+        assert response.json() == {'score': 5}
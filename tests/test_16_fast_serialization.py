@@ -0,0 +1,74 @@
+import pytest
+from django.core.cache import caches
+
+from api.fast import FastListSerializer, FastTitleListSerializer
+from api.mixins import FastListMixin
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleReadSerializer)
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16FastSerialization:
+
+    def get_both(self, client, url, monkeypatch):
+        fast = client.get(url)
+        for cache in caches.all():
+            cache.clear()
+        with monkeypatch.context() as patch:
+            patch.setattr(
+                FastListMixin, 'list',
+                lambda self, request, *args, **kwargs: super(
+                    FastListMixin, self
+                ).list(request, *args, **kwargs)
+            )
+            regular = client.get(url)
+        return fast, regular
+
+    def test_00_plans_supported(self):
+        for fast_class, serializer in (
+            (FastTitleListSerializer, TitleReadSerializer()),
+            (FastListSerializer, ReviewSerializer()),
+            (FastListSerializer, CommentSerializer()),
+        ):
+            assert fast_class(serializer).supported, (
+                'Проверьте, что для всех полей сериализатора '
+                f'{type(serializer).__name__} строится быстрый план.'
+            )
+
+    def test_01_byte_identical(self, admin_client, admin, user_client, user,
+                               monkeypatch):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for url in (
+            '/api/v1/titles/',
+            '/api/v1/titles/?ordering=-rating&cursor=&limit=2',
+            '/api/v1/titles/?fields=id,rating,genre&omit=genre',
+            reviews_url,
+            f'{reviews_url}?cursor=',
+            f'{reviews_url}{reviews[0]["id"]}/comments/',
+            f'{reviews_url}{reviews[0]["id"]}/comments/?omit=pub_date',
+        ):
+            fast, regular = self.get_both(admin_client, url, monkeypatch)
+            assert fast.status_code == regular.status_code == 200
+            assert fast.content == regular.content, (
+                f'Проверьте, что быстрый список `{url}` совпадает '
+                'с ответом обычного сериализатора побайтно.'
+            )
+
+    def test_02_cursor_follows(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor=&limit=1'
+        seen = []
+        while url:
+            data = admin_client.get(url).json()
+            seen.extend(review['id'] for review in data['results'])
+            url = data['next']
+        assert seen == [review['id'] for review in reviews], (
+            'Проверьте, что keyset-пагинация работает со строками '
+            'быстрого списка.'
+        )
@@ -0,0 +1,82 @@
+import datetime
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from django.utils.functional import lazy
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import FastJSONRenderer
+from tests.utils import create_titles
+
+SAMPLES = (
+    {'count': 3, 'next': None, 'results': [1, 'два', None, True]},
+    OrderedDict([('b', 1), ('a', [1.5, 0.1, -0.0])]),
+    [datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)],
+    [datetime.datetime(2024, 1, 2, 3, 4, 5)],
+    [datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone(
+        datetime.timedelta(hours=3)
+    ))],
+    [datetime.date(2024, 1, 2), datetime.time(3, 4)],
+    [datetime.timedelta(seconds=90)],
+    [Decimal('1.10'), Decimal('0.00001'), Decimal('1e20')],
+    [1e16, 1e-05, 123456789.123, 2 ** 70],
+    {1: 'int key', 'text': 'строка с разделителями "и" \\'},
+    [uuid.UUID('12345678-1234-5678-1234-567812345678')],
+    [lazy(lambda: 'ленивая строка', str)()],
+    (1, 2, 3),
+)
+
+
+class Test17Renderer:
+
+    @pytest.mark.parametrize('use_orjson', (True, False))
+    def test_01_same_output(self, use_orjson, monkeypatch):
+        if not use_orjson:
+            monkeypatch.setattr(renderers, 'orjson', None)
+        for data in SAMPLES:
+            assert FastJSONRenderer().render(data) == (
+                JSONRenderer().render(data)
+            ), (
+                'Проверьте, что FastJSONRenderer кодирует '
+                f'{data!r} так же, как JSONRenderer.'
+            )
+        assert FastJSONRenderer().render(
+            {'a': [1]}, 'application/json; indent=4'
+        ) == JSONRenderer().render({'a': [1]}, 'application/json; indent=4')
+
+    def test_02_render_stream(self, settings):
+        settings.API_STREAM_CHUNK_SIZE = 2
+        renderer = FastJSONRenderer()
+        for data in (
+            {'count': 5, 'results': [{'id': i} for i in range(5)],
+             'next': None},
+            {'results': []},
+            [{'id': i, 'name': 'имя'} for i in range(3)],
+        ):
+            assert b''.join(renderer.render_stream(data)) == (
+                renderer.render(data)
+            ), (
+                'Проверьте, что потоковый вывод совпадает с обычным.'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_streaming_list(self, client, admin_client, settings):
+        create_titles(admin_client)
+        url = '/api/v1/titles/?limit=100'
+        regular = client.get(url)
+        assert not regular.streaming
+
+        settings.API_STREAM_MIN_ITEMS = 2
+        settings.API_STREAM_CHUNK_SIZE = 1
+        streamed = client.get(url)
+        assert streamed.streaming, (
+            'Проверьте, что длинный список отдаётся потоком.'
+        )
+        assert streamed['Content-Type'] == 'application/json'
+        assert b''.join(streamed.streaming_content) == regular.content, (
+            'Проверьте, что потоковый ответ совпадает с обычным.'
+        )
@@ -0,0 +1,104 @@
+import csv
+import gzip
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+from tests.utils import create_comments, create_titles
+
+
+def read_stream(response):
+    return b''.join(response.streaming_content)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Export:
+
+    EXPORT_URL = '/api/v1/export/{dataset}/'
+
+    def test_01_only_admin(self, client, user_client):
+        url = self.EXPORT_URL.format(dataset='titles')
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{url}` доступен только администратору.'
+        )
+
+    def test_02_ndjson(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = admin_client.get(self.EXPORT_URL.format(dataset='titles'))
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоком.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = [json.loads(line) for line in read_stream(response).split(
+            b'\n'
+        ) if line]
+        assert [line['id'] for line in lines] == sorted(
+            title['id'] for title in titles
+        )
+        first = next(line for line in lines if line['id'] == titles[0]['id'])
+        assert first['rating'] == 5
+        assert first['genre'] == sorted(titles[0]['genre'])
+        assert first['category'] == titles[0]['category']
+
+        for dataset, expected in (
+            ('reviews', reviews), ('comments', comments)
+        ):
+            content = read_stream(admin_client.get(
+                self.EXPORT_URL.format(dataset=dataset)
+            ))
+            rows = [json.loads(line) for line in content.splitlines()]
+            assert [
+                (row['id'], row['author'], row['text']) for row in rows
+            ] == [
+                (item['id'], item['author'], item['text']) for item in expected
+            ]
+
+    def test_03_csv_gzip_since(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.EXPORT_URL.format(dataset='reviews')
+        response = admin_client.get(f'{url}?format=csv&gzip=1')
+        assert response['Content-Type'] == 'application/gzip'
+        rows = list(csv.DictReader(io.StringIO(
+            gzip.decompress(read_stream(response)).decode('utf-8')
+        )))
+        assert [int(row['id']) for row in rows] == [
+            review['id'] for review in reviews
+        ], (
+            'Проверьте, что выгрузка в CSV с gzip содержит все отзывы.'
+        )
+
+        response = admin_client.get(f'{url}?since=2999-01-01')
+        assert read_stream(response) == b'', (
+            'Проверьте, что параметр since отбирает только новые записи.'
+        )
+        response = admin_client.get(f'{url}?since=вчера')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.get(self.EXPORT_URL.format(dataset='users'))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_title_modified_and_command(self, admin_client, tmp_path):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'/api/v1/titles/{titles[1]["id"]}/', data={'name': 'Новое'}
+        )
+        since = Title.objects.get(pk=titles[1]['id']).modified
+        output = tmp_path / 'titles.ndjson'
+        call_command(
+            'export_catalogue', 'titles', '--since', since.isoformat(),
+            '--output', str(output)
+        )
+        rows = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [row['name'] for row in rows] == ['Новое'], (
+            'Проверьте, что since для произведений учитывает время '
+            'изменения.'
+        )
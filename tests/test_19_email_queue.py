@@ -0,0 +1,104 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from users.mail import enqueue_email, send_queued
+from users.models import OutgoingEmail
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19EmailQueue:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_enqueues(self, client, settings):
+        settings.EMAIL_QUEUE_EAGER = False
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert not mail.outbox, (
+            'Проверьте, что регистрация не отправляет письмо в запросе, '
+            'а ставит его в очередь.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.to == data['email'] and email.sent is None
+
+        call_command('send_emails')
+        assert [message.to for message in mail.outbox] == [[data['email']]]
+        assert 'Ваш код подтверждения' in mail.outbox[0].body
+        email.refresh_from_db()
+        assert email.sent is not None and email.attempts == 1, (
+            'Проверьте, что воркер отмечает отправленные письма.'
+        )
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно.'
+        )
+
+    def test_02_batches_share_connection(self, settings, monkeypatch):
+        settings.EMAIL_QUEUE_EAGER = False
+        for idx in range(5):
+            enqueue_email('Тема', 'Текст', f'user{idx}@yamdb.fake')
+        opened = []
+        original_open = EmailBackend.open
+        monkeypatch.setattr(
+            EmailBackend, 'open',
+            lambda self: opened.append(self) or original_open(self)
+        )
+        assert send_queued(batch_size=3) == 3
+        assert send_queued(batch_size=3) == 2
+        assert send_queued(batch_size=3) == 0
+        assert len(opened) == 2, (
+            'Проверьте, что пачка писем отправляется через одно соединение.'
+        )
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{idx}@yamdb.fake' for idx in range(5)
+        ]
+
+    def test_03_retries(self, settings, monkeypatch):
+        settings.EMAIL_QUEUE_EAGER = False
+        enqueue_email('Тема', 'Текст', 'fail@yamdb.fake')
+        enqueue_email('Тема', 'Текст', 'ok@yamdb.fake')
+        original_send = EmailMessage.send
+
+        def send(message, *args, **kwargs):
+            if message.to == ['fail@yamdb.fake']:
+                raise ConnectionError('SMTP недоступен')
+            return original_send(message, *args, **kwargs)
+
+        monkeypatch.setattr(EmailMessage, 'send', send)
+        assert send_queued() == 1
+        failed = OutgoingEmail.objects.get(to='fail@yamdb.fake')
+        assert failed.sent is None and failed.attempts == 1
+        assert 'SMTP недоступен' in failed.error
+        assert failed.next_attempt > timezone.now(), (
+            'Проверьте, что повторная попытка откладывается.'
+        )
+        assert send_queued() == 0
+
+        monkeypatch.undo()
+        OutgoingEmail.objects.filter(pk=failed.pk).update(
+            next_attempt=timezone.now() - timedelta(seconds=1)
+        )
+        assert send_queued() == 1, (
+            'Проверьте, что письмо отправляется при повторной попытке.'
+        )
+        assert [message.to[0] for message in mail.outbox] == [
+            'ok@yamdb.fake', 'fail@yamdb.fake'
+        ]
+
+    def test_04_eager(self, client, settings):
+        settings.EMAIL_QUEUE_EAGER = True
+        data = {'email': 'eager@yamdb.fake', 'username': 'eager'}
+        client.post(self.URL_SIGNUP, data=data)
+        assert len(mail.outbox) == 1
+        assert OutgoingEmail.objects.get().sent is not None, (
+            'Проверьте, что с EMAIL_QUEUE_EAGER письмо отправляется '
+            'сразу после записи в очередь.'
+        )
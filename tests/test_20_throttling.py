@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.throttling import take_token
+
+
+@pytest.fixture
+def rates(settings):
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates
+        }
+    return set_rates
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Throttling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def test_01_token_bucket(self):
+        state, wait = None, 0
+        for _ in range(3):
+            state, wait = take_token(state, 0, 3, 60)
+            assert wait == 0
+        state, wait = take_token(state, 1, 3, 60)
+        assert wait == pytest.approx(19), (
+            'Проверьте, что пустая корзина сообщает время до следующего '
+            'токена.'
+        )
+        state, wait = take_token(state, 21, 3, 60)
+        assert wait == 0, 'Проверьте, что корзина пополняется со временем.'
+
+    def test_02_signup_identity(self, client, rates):
+        rates(signup_ip='100/min', signup_identity='2/min')
+        data = {'username': 'throttled', 'email': 'throttled@yamdb.fake'}
+        for _ in range(2):
+            assert client.post(self.URL_SIGNUP, data=data).status_code == (
+                HTTPStatus.OK
+            )
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data={
+                'username': 'other', 'email': 'THROTTLED@yamdb.fake'
+            })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что частота регистраций ограничена по email.'
+        )
+        assert 'Retry-After' in response
+        assert not context.captured_queries, (
+            'Проверьте, что отклонённый запрос не обращается к БД.'
+        )
+        response = client.post(self.URL_SIGNUP, data={
+            'username': 'another', 'email': 'another@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ограничение по username и email не мешает '
+            'другим пользователям.'
+        )
+
+    def test_03_token_ip(self, client, rates):
+        rates(token_ip='3/min', token_identity='100/min')
+        statuses = [
+            client.post(self.URL_TOKEN, data={
+                'username': f'user{idx}', 'confirmation_code': '12345'
+            }).status_code
+            for idx in range(4)
+        ]
+        assert statuses == [HTTPStatus.NOT_FOUND] * 3 + [
+            HTTPStatus.TOO_MANY_REQUESTS
+        ], (
+            'Проверьте, что частота запросов токена ограничена по IP.'
+        )
+        response = client.post(
+            self.URL_TOKEN, data={'username': 'user0'},
+            REMOTE_ADDR='10.0.0.2'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_shared_cache(self, client, rates, settings):
+        settings.API_THROTTLE_CACHE_ALIAS = 'default'
+        rates(signup_ip='1/min')
+        data = {'username': 'shared', 'email': 'shared@yamdb.fake'}
+        assert client.post(self.URL_SIGNUP, data=data).status_code == (
+            HTTPStatus.OK
+        )
+        assert client.post(self.URL_SIGNUP, data=data).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+        assert caches['default'].get(
+            'api:throttle:signup:ip:127.0.0.1'
+        ) is not None, (
+            'Проверьте, что корзины хранятся в кеше из '
+            'API_THROTTLE_CACHE_ALIAS.'
+        )
+
+    @pytest.mark.parametrize('url', (URL_SIGNUP, URL_TOKEN))
+    def test_05_non_object_body(self, client, url):
+        response = client.post(
+            url, data='[1, 2]', content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{url}` с JSON-массивом вместо '
+            'объекта возвращает ответ со статусом 400.'
+        )
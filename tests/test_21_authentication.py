@@ -0,0 +1,54 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.backends import TokenBackend
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21CachedAuthentication:
+
+    URL_ME = '/api/v1/users/me/'
+
+    def test_01_repeated_requests(self, user_client, monkeypatch):
+        assert user_client.get(self.URL_ME).status_code == HTTPStatus.OK
+        decoded = []
+        original_decode = TokenBackend.decode
+        monkeypatch.setattr(
+            TokenBackend, 'decode',
+            lambda self, *args, **kwargs: decoded.append(args) or (
+                original_decode(self, *args, **kwargs)
+            )
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert not [
+            query['sql'] for query in context.captured_queries
+            if '"users_user"' in query['sql']
+        ], (
+            'Проверьте, что пользователь повторного запроса с тем же '
+            'токеном берётся из кеша аутентификации.'
+        )
+        assert not decoded, (
+            'Проверьте, что подпись уже проверенного токена не '
+            'проверяется повторно.'
+        )
+
+    def test_02_invalidation(self, admin_client, user, user_client):
+        assert user_client.get(self.URL_ME).json()['role'] == 'user'
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        assert user_client.get(self.URL_ME).json()['role'] == 'moderator', (
+            'Проверьте, что изменение пользователя сбрасывает его из кеша '
+            'аутентификации.'
+        )
+        user.delete()
+        assert user_client.get(self.URL_ME).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что удалённый пользователь не аутентифицируется '
+            'из кеша.'
+        )